@@ -1 +1,8 @@
 from .aio import *  # noqa
+from .stats import *  # noqa
+from .multiplex import *  # noqa
+from .capture import *  # noqa
+from .coalesce import *  # noqa
+from .peers import *  # noqa
+from .pipeline import *  # noqa
+from .fragment import *  # noqa
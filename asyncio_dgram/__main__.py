@@ -0,0 +1,3 @@
+from .capture import main
+
+main()
@@ -1,13 +1,34 @@
 import asyncio
+import collections
 import pathlib
 import socket
 import sys
+import time
 import warnings
 
-__all__ = ("TransportClosed", "bind", "connect", "from_socket")
+from .stats import Histogram
+
+__all__ = (
+    "TransportClosed",
+    "bind",
+    "bind_many",
+    "close_all",
+    "connect",
+    "connect_many",
+    "from_socket",
+    "pair",
+)
 
 _windows = sys.platform == "win32"
 
+# Not exposed by the socket module, value from linux/asm-generic/socket.h
+_SO_BUSY_POLL = getattr(
+    socket, "SO_BUSY_POLL", 46 if sys.platform.startswith("linux") else None
+)
+
+# Same as asyncio's selector based datagram transport.
+_MAX_DATAGRAM_SIZE = 256 * 1024
+
 
 class TransportClosed(Exception):
     """
@@ -44,10 +65,23 @@ class DatagramStream:
                               paused and set otherwise.
         """
         self._transport = transport
+        self._protocol = transport.get_protocol()
         self._recvq = recvq
         self._excq = excq
         self._drained = drained
 
+        # Latency sampling, disabled until enable_latency_stats().
+        self._send_hist = None
+        self._send_sample_every = 0
+        self._send_countdown = 0
+
+        # Traffic capture, see set_capture().
+        self._capture = None
+
+        # Busy polling, see enable_busy_poll().
+        self._busy_poll_sock = None
+        self._busy_poll_spin = 0.0
+
     def __del__(self):
         self._transport.close()
 
@@ -86,6 +120,129 @@ class DatagramStream:
         """
         return self._transport.get_extra_info("socket")
 
+    @property
+    def recv_flow_stats(self):
+        """
+        Receive flow control counters as a dictionary:
+            paused      - True if reading is currently paused.
+            pause_count - number of times reading has been paused.
+            paused_time - total seconds reading has spent paused, including
+                          the current pause.
+        """
+        return self._protocol.recv_flow_stats()
+
+    def set_recv_queue_limits(self, high=None, low=None):
+        """
+        Set the watermarks of the queue of received datagrams waiting to be
+        consumed by recv().  Once the queue holds high datagrams, reading from
+        the socket is paused, leaving further datagrams in the kernel socket
+        buffer, until recv() brings the queue back down to low.  For UDP that
+        means the kernel drops datagrams once its buffer is full, for AF_UNIX
+        local senders block or are paused.
+
+        By default no limits are applied and the queue grows without bound.
+
+        @param high - number of queued datagrams at which reading is paused,
+                      None to disable flow control.
+        @param low  - number of queued datagrams at which reading is resumed,
+                      defaults to a quarter of high.
+        """
+        self._protocol.set_recv_queue_limits(high, low)
+
+    @property
+    def latency_stats(self):
+        """
+        Latency histograms as a dictionary, or None if they have not been
+        enabled with enable_latency_stats():
+            recv_queue  - time from a datagram being received by the protocol
+                          until it is returned by recv().
+            send_drain  - time send() spent waiting for the write buffer to
+                          drain.
+        Each entry is the result of Histogram.to_dict().
+        """
+        if self._send_hist is None:
+            return None
+
+        return {
+            "recv_queue": self._protocol.recv_histogram.to_dict(),
+            "send_drain": self._send_hist.to_dict(),
+        }
+
+    def enable_latency_stats(self, sample_every=1):
+        """
+        Start recording latency histograms, see latency_stats.  Calling this
+        again resets the histograms.
+
+        @param sample_every - only time one out of every sample_every
+                              datagrams, to keep the overhead low at high
+                              packet rates.
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1, not %r" % (sample_every,))
+
+        self._send_hist = Histogram()
+        self._send_sample_every = sample_every
+        self._send_countdown = sample_every
+        self._protocol.set_recv_histogram(Histogram(), sample_every)
+
+    def disable_latency_stats(self):
+        """
+        Stop recording and discard the latency histograms.
+        """
+        self._send_hist = None
+        self._protocol.set_recv_histogram(None)
+
+    def set_capture(self, recorder):
+        """
+        Tee all datagrams sent and received by this stream to a recorder.
+        Received datagrams are recorded as they arrive from the socket, not as
+        they are returned by recv().
+
+        @param recorder - object providing record_send(data) and
+                          record_recv(data), typically a
+                          asyncio_dgram.Recorder.  None to stop capturing.
+        """
+        self._capture = recorder
+        self._protocol.capture = recorder
+
+    def enable_busy_poll(self, spin=0.0, so_busy_poll=None):
+        """
+        Have recv() read directly from the socket when nothing is queued
+        rather than immediately waiting on the event loop, trading CPU for
+        lower latency.  The event loop is blocked while spinning, so keep spin
+        short and only use this for latency critical streams.
+
+        This has no effect on Windows or on streams created by pair().
+
+        @param spin         - seconds to keep retrying the read before falling
+                              back to waiting on the event loop, 0 for a single
+                              attempt.
+        @param so_busy_poll - if not None, microseconds to set SO_BUSY_POLL to,
+                              having the kernel poll the device queue on
+                              reads.  Linux only and values over
+                              net.core.busy_read require CAP_NET_ADMIN.
+
+        @raises OSError - Setting SO_BUSY_POLL failed.
+        """
+        if spin < 0:
+            raise ValueError("spin must be >= 0, not %r" % (spin,))
+
+        if so_busy_poll is not None:
+            if _SO_BUSY_POLL is None:
+                raise OSError("SO_BUSY_POLL is not supported on this platform")
+            self.socket.setsockopt(socket.SOL_SOCKET, _SO_BUSY_POLL, so_busy_poll)
+
+        if not _windows:
+            self._busy_poll_sock = getattr(self._transport, "_sock", None)
+        self._busy_poll_spin = spin
+
+    def disable_busy_poll(self):
+        """
+        Stop busy polling in recv().  SO_BUSY_POLL is left as is.
+        """
+        self._busy_poll_sock = None
+        self._busy_poll_spin = 0.0
+
     def close(self):
         """
         Close the underlying transport.
@@ -106,6 +263,18 @@ class DatagramStream:
 
         _ = self.exception
         self._transport.sendto(data, addr)
+        if self._capture is not None:
+            self._capture.record_send(data)
+
+        if self._send_hist is not None:
+            self._send_countdown -= 1
+            if self._send_countdown == 0:
+                self._send_countdown = self._send_sample_every
+                start = time.monotonic_ns()
+                await self._drained.wait()
+                self._send_hist.record(time.monotonic_ns() - start)
+                return
+
         await self._drained.wait()
 
     async def recv(self):
@@ -121,10 +290,51 @@ class DatagramStream:
             raise TransportClosed()
 
         _ = self.exception
+        if self._busy_poll_sock is not None and self._recvq.empty():
+            self._busy_poll()
+
         data, addr = await self._recvq.get()
         if data is None:
             raise TransportClosed()
 
+        self._protocol.recv_consumed()
+        return data, addr
+
+    def _busy_poll(self):
+        """
+        Try reading a datagram straight from the socket, feeding it through
+        the protocol exactly as the transport would have.
+        """
+        sock = self._busy_poll_sock
+        deadline = time.monotonic() + self._busy_poll_spin
+
+        while True:
+            try:
+                data, addr = sock.recvfrom(_MAX_DATAGRAM_SIZE)
+            except (BlockingIOError, InterruptedError):
+                if time.monotonic() >= deadline:
+                    return
+            except OSError as exc:
+                self._protocol.error_received(exc)
+                return
+            else:
+                self._protocol.datagram_received(data, addr)
+                return
+
+    def _recv_nowait(self):
+        """
+        Receive an already queued datagram without waiting.
+
+        @return - tuple of the bytes received and the address they came from.
+
+        @raises asyncio.QueueEmpty  - No datagram is queued.
+        @raises TransportClosed     - DatagramTransport closed.
+        """
+        data, addr = self._recvq.get_nowait()
+        if data is None:
+            raise TransportClosed()
+
+        self._protocol.recv_consumed()
         return data, addr
 
 
@@ -153,6 +363,29 @@ class DatagramClient(DatagramStream):
         await super()._send(data)
 
 
+def _sender(stream, addr=None):
+    """
+    Used by helpers that write through either kind of stream.
+
+    @param stream   - DatagramStream to send through.
+    @param addr     - destination address, required if stream is a
+                      DatagramServer.
+    @return         - coroutine function taking the data to send.
+
+    @raises ValueError - stream is a DatagramServer and addr is None.
+    """
+    if not isinstance(stream, DatagramServer):
+        return stream.send
+
+    if addr is None:
+        raise ValueError("addr is required when sending through a server")
+
+    async def send(data):
+        await stream.send(data, addr)
+
+    return send
+
+
 class Protocol(asyncio.DatagramProtocol):
     """
     asyncio.DatagramProtocol for feeding received packets into the
@@ -176,6 +409,31 @@ class Protocol(asyncio.DatagramProtocol):
         # Transports are connected at the time a connection is made.
         self._transport = None
 
+        # Receive flow control, disabled until set_recv_queue_limits().
+        self._recv_high_water = None
+        self._recv_low_water = None
+        self._reading_paused = False
+        self._pause_count = 0
+        self._paused_time = 0.0
+        self._paused_at = 0.0
+
+        # Residence time sampling, disabled until set_recv_histogram().
+        # Sampled datagrams are remembered by their sequence number in the
+        # receive queue along with the time they arrived.
+        self.recv_histogram = None
+        self._recv_sample_every = 0
+        self._recv_countdown = 0
+        self._recv_seq = 0
+        self._consumed_seq = 0
+        self._recv_samples = collections.deque()
+
+        # Tee of received datagrams, see DatagramStream.set_capture().
+        self.capture = None
+
+        # Called whenever something is added to the receive queue, used by
+        # StreamSet to track which streams are ready.
+        self._ready_cb = None
+
     def connection_made(self, transport):
         if self._transport is not None:
             old_peer = self._transport.get_extra_info("peername")
@@ -191,6 +449,12 @@ class Protocol(asyncio.DatagramProtocol):
             self._excq.put_nowait(exc)
 
         self._recvq.put_nowait((None, None))
+        if self._ready_cb is not None:
+            self._ready_cb()
+
+        if self._reading_paused:
+            self._reading_paused = False
+            self._paused_time += time.monotonic() - self._paused_at
 
         if self._transport is not None:
             self._transport.close()
@@ -199,8 +463,30 @@ class Protocol(asyncio.DatagramProtocol):
     def datagram_received(self, data, addr):
         self._recvq.put_nowait((data, addr))
 
+        if self.capture is not None:
+            self.capture.record_recv(data)
+
+        if self.recv_histogram is not None:
+            self._recv_seq += 1
+            self._recv_countdown -= 1
+            if self._recv_countdown == 0:
+                self._recv_countdown = self._recv_sample_every
+                self._recv_samples.append((self._recv_seq, time.monotonic_ns()))
+
+        if self._ready_cb is not None:
+            self._ready_cb()
+
+        if (
+            self._recv_high_water is not None
+            and not self._reading_paused
+            and self._recvq.qsize() >= self._recv_high_water
+        ):
+            self._pause_reading()
+
     def error_received(self, exc):
         self._excq.put_nowait(exc)
+        if self._ready_cb is not None:
+            self._ready_cb()
 
     def pause_writing(self):
         self._drained.clear()
@@ -210,6 +496,282 @@ class Protocol(asyncio.DatagramProtocol):
         self._drained.set()
         super().resume_writing()
 
+    def set_recv_queue_limits(self, high=None, low=None):
+        """
+        @param high - receive queue length at which reading is paused, None to
+                      disable receive flow control.
+        @param low  - receive queue length at which reading is resumed,
+                      defaults to high // 4.
+        """
+        if high is None:
+            if low is not None:
+                raise ValueError("low requires high to be set")
+        else:
+            if low is None:
+                low = high // 4
+            if not high >= low >= 0 or high == 0:
+                raise ValueError(
+                    "high (%r) must be > 0 and >= low (%r) must be >= 0" % (high, low)
+                )
+
+        self._recv_high_water = high
+        self._recv_low_water = low
+
+        if high is None:
+            self._resume_reading()
+        elif self._recvq.qsize() >= high:
+            self._pause_reading()
+        else:
+            self._maybe_resume_reading()
+
+    def recv_consumed(self):
+        """
+        Called by the DatagramStream whenever a datagram has been taken off of
+        the receive queue.
+        """
+        if self.recv_histogram is not None:
+            self._consumed_seq += 1
+            samples = self._recv_samples
+            # Anything older than the datagram just consumed can never match,
+            # drop it rather than letting the samples grow.
+            while samples and samples[0][0] <= self._consumed_seq:
+                seq, received = samples.popleft()
+                if seq == self._consumed_seq:
+                    self.recv_histogram.record(time.monotonic_ns() - received)
+
+        self._maybe_resume_reading()
+
+    def _maybe_resume_reading(self):
+        if self._reading_paused and self._recvq.qsize() <= self._recv_low_water:
+            self._resume_reading()
+
+    def recv_flow_stats(self):
+        """
+        @return - dictionary of receive flow control counters, see
+                  DatagramStream.recv_flow_stats.
+        """
+        paused_time = self._paused_time
+        if self._reading_paused:
+            paused_time += time.monotonic() - self._paused_at
+
+        return {
+            "paused": self._reading_paused,
+            "pause_count": self._pause_count,
+            "paused_time": paused_time,
+        }
+
+    def set_recv_histogram(self, histogram, sample_every=1):
+        """
+        @param histogram    - Histogram recording how long datagrams spend in
+                              the receive queue, None to stop recording.
+        @param sample_every - record one out of every sample_every datagrams.
+        """
+        self.recv_histogram = histogram
+        self._recv_sample_every = sample_every
+        self._recv_countdown = sample_every
+        self._recv_samples.clear()
+
+        # Datagrams already queued were not timed, skip over them.
+        self._recv_seq = self._recvq.qsize()
+        self._consumed_seq = 0
+
+    def set_ready_callback(self, callback):
+        """
+        @param callback - callable taking no arguments invoked every time a
+                          datagram, an error or the end of the stream is
+                          queued.  None to remove the current callback.
+
+        @raises ValueError - a callback is already set.
+        """
+        if callback is not None and self._ready_cb is not None:
+            raise ValueError("stream already belongs to a StreamSet")
+
+        self._ready_cb = callback
+
+    def _pause_reading(self):
+        if self._reading_paused or self._transport is None:
+            return
+
+        self._reading_paused = True
+        self._pause_count += 1
+        self._paused_at = time.monotonic()
+        self._transport.pause_reading()
+
+    def _resume_reading(self):
+        if not self._reading_paused:
+            return
+
+        # Update state first, resuming may synchronously deliver datagrams.
+        self._reading_paused = False
+        self._paused_time += time.monotonic() - self._paused_at
+        if self._transport is not None:
+            self._transport.resume_reading()
+
+
+class _PairTransport(asyncio.DatagramTransport):
+    """
+    In-memory asyncio.DatagramTransport connected to another _PairTransport.
+    Datagrams are handed straight to the peer's protocol without touching a
+    socket.  Semantics follow those of a connected AF_UNIX datagram socket:
+    neither end has an address, sending to a closed peer reports
+    ConnectionRefusedError and a peer that has paused reading causes
+    datagrams to be buffered, pausing the writing protocol once the buffer
+    passes the high watermark.  Closing delivers whatever is still buffered
+    before connection_lost() is called, unless the peer closes or the
+    transport is aborted first.
+    """
+
+    def __init__(self, loop, protocol):
+        """
+        @param loop     - event loop used to schedule protocol callbacks.
+        @param protocol - asyncio.DatagramProtocol fed by the peer transport.
+        """
+        super().__init__(extra={"sockname": None, "peername": None, "socket": None})
+        self._loop = loop
+        self._protocol = protocol
+        self._peer = None
+        self._closing = False
+        self._reading_paused = False
+        self._protocol_paused = False
+        self._buffer = collections.deque()
+        self._buffer_size = 0
+        self.set_write_buffer_limits()
+
+    def get_protocol(self):
+        return self._protocol
+
+    def set_protocol(self, protocol):
+        self._protocol = protocol
+
+    def is_closing(self):
+        return self._closing
+
+    def close(self):
+        if self._closing:
+            return
+
+        self._closing = True
+
+        peer = self._peer
+        if peer is not None:
+            # Anything the peer had queued for us is lost.
+            peer._drop_buffer()
+
+        # Otherwise called once the buffer has been delivered.
+        if not self._buffer:
+            self._loop.call_soon(self._protocol.connection_lost, None)
+
+    def abort(self):
+        if self._closing:
+            self._drop_buffer()
+        else:
+            self._clear_buffer()
+            self.close()
+
+    def is_reading(self):
+        return not self._closing and not self._reading_paused
+
+    def pause_reading(self):
+        self._reading_paused = True
+
+    def resume_reading(self):
+        if not self._reading_paused:
+            return
+
+        self._reading_paused = False
+        if self._peer is not None:
+            self._peer._flush()
+
+    def get_write_buffer_size(self):
+        return self._buffer_size
+
+    def get_write_buffer_limits(self):
+        return (self._low_water, self._high_water)
+
+    def set_write_buffer_limits(self, high=None, low=None):
+        if high is None:
+            high = 64 * 1024 if low is None else 4 * low
+        if low is None:
+            low = high // 4
+
+        if not high >= low >= 0:
+            raise ValueError("high (%r) must be >= low (%r) must be >= 0" % (high, low))
+
+        self._high_water = high
+        self._low_water = low
+        self._maybe_pause_protocol()
+
+    def sendto(self, data, addr=None):
+        if addr is not None:
+            raise ValueError("Invalid address: must be None")
+
+        if self._closing:
+            return
+
+        peer = self._peer
+        if peer is None or peer._closing:
+            self._loop.call_soon(
+                self._protocol.error_received, ConnectionRefusedError()
+            )
+            return
+
+        # Copy, as the kernel would, so callers may reuse their buffers.
+        data = bytes(data)
+        if self._buffer or peer._reading_paused:
+            self._buffer.append(data)
+            self._buffer_size += len(data)
+            self._maybe_pause_protocol()
+        else:
+            peer._protocol.datagram_received(data, None)
+
+    def _flush(self):
+        """
+        Deliver buffered datagrams to the peer until it pauses reading again.
+        """
+        if not self._buffer:
+            return
+
+        peer = self._peer
+        while self._buffer and not peer._reading_paused:
+            data = self._buffer.popleft()
+            self._buffer_size -= len(data)
+            peer._protocol.datagram_received(data, None)
+
+        self._maybe_resume_protocol()
+        if self._closing and not self._buffer:
+            self._loop.call_soon(self._protocol.connection_lost, None)
+
+    def _drop_buffer(self):
+        """
+        Discard buffered datagrams, finishing a close that was waiting on
+        them.
+        """
+        if not self._buffer:
+            return
+
+        self._clear_buffer()
+        self._maybe_resume_protocol()
+        if self._closing:
+            self._loop.call_soon(self._protocol.connection_lost, None)
+
+    def _clear_buffer(self):
+        self._buffer.clear()
+        self._buffer_size = 0
+
+    def _maybe_pause_protocol(self):
+        if self._protocol_paused or self._buffer_size <= self._high_water:
+            return
+
+        self._protocol_paused = True
+        self._protocol.pause_writing()
+
+    def _maybe_resume_protocol(self):
+        if not self._protocol_paused or self._buffer_size > self._low_water:
+            return
+
+        self._protocol_paused = False
+        self._protocol.resume_writing()
+
 
 async def bind(addr, reuse_port=None):
     """
@@ -323,3 +885,194 @@ async def from_socket(sock):
         return DatagramClient(transport, recvq, excq, drained)
     else:
         return DatagramServer(transport, recvq, excq, drained)
+
+
+async def pair():
+    """
+    Create two DatagramClients connected to each other through an in-memory
+    channel rather than a socket.  This is meant for components living in the
+    same process which would otherwise talk over a connected AF_UNIX datagram
+    socket; the returned streams behave the same way, including
+    TransportClosed, ConnectionRefusedError when the other end has been
+    closed, and write backpressure, but no system calls are made.
+
+    As with unnamed AF_UNIX sockets, sockname and peername are None and
+    received datagrams have an address of None.
+
+    @return     - A tuple of two connected DatagramClient instances
+    """
+    loop = asyncio.get_event_loop()
+    streams = []
+    transports = []
+
+    for _ in range(2):
+        recvq = asyncio.Queue()
+        excq = asyncio.Queue()
+        drained = asyncio.Event()
+        protocol = Protocol(recvq, excq, drained)
+        transport = _PairTransport(loop, protocol)
+        protocol.connection_made(transport)
+
+        transports.append(transport)
+        streams.append(DatagramClient(transport, recvq, excq, drained))
+
+    transports[0]._peer = transports[1]
+    transports[1]._peer = transports[0]
+
+    return streams[0], streams[1]
+
+
+async def _resolve_many(addrs, passive):
+    """
+    Resolve a list of addresses, looking up each distinct address only once.
+
+    @param addrs    - addresses as accepted by bind() or connect().
+    @param passive  - True when resolving addresses to bind to.
+    @return         - list of (family, sockaddr) for each address.
+    """
+    loop = asyncio.get_event_loop()
+    cache = {}
+    resolved = []
+
+    for addr in addrs:
+        if not _windows and not isinstance(addr, tuple):
+            resolved.append((socket.AF_UNIX, str(addr)))
+            continue
+
+        if addr not in cache:
+            host, port = addr[:2]
+            infos = await loop.getaddrinfo(
+                host,
+                port,
+                type=socket.SOCK_DGRAM,
+                flags=socket.AI_PASSIVE if passive else 0,
+            )
+            if not infos:
+                raise OSError("getaddrinfo returned an empty list for %r" % (addr,))
+
+            family, _, _, _, sockaddr = infos[0]
+            cache[addr] = (family, sockaddr)
+
+        resolved.append(cache[addr])
+
+    return resolved
+
+
+async def _from_sockets(socks):
+    """
+    Wrap many sockets in DatagramStreams.  On failure every socket, including
+    those already wrapped, is closed.
+
+    Creating the endpoints one after the other is cheaper than gathering
+    them, each only needs a single pass of the event loop.
+    """
+    streams = []
+    try:
+        for sock in socks:
+            streams.append(await from_socket(sock))
+    except BaseException:
+        close_all(streams)
+        for sock in socks:
+            sock.close()
+        raise
+
+    return streams
+
+
+async def bind_many(addrs, reuse_port=None):
+    """
+    Bind many sockets at once, see bind().  Each distinct address is only
+    resolved once, which saves lookups when hostnames are repeated.  Every
+    socket is still wrapped in its own stream as by from_socket(), so for
+    numeric addresses this is no quicker than calling bind() repeatedly.
+
+    @param addrs        - list of local addresses to bind, the same address
+                          may be repeated when its port is 0.
+    @param reuse_port   - set SO_REUSEPORT on every socket, see bind().
+    @return             - list of DatagramServer instances, in the order of
+                          addrs.
+    """
+    if reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+        raise ValueError("reuse_port not supported by socket module")
+
+    resolved = await _resolve_many(addrs, passive=True)
+    socks = []
+
+    try:
+        for family, sockaddr in resolved:
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            socks.append(sock)
+            sock.setblocking(False)
+            if reuse_port:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind(sockaddr)
+    except BaseException:
+        for sock in socks:
+            sock.close()
+        raise
+
+    return await _from_sockets(socks)
+
+
+async def connect_many(addrs, local_port_range=None):
+    """
+    Connect many sockets at once, see connect().  Each distinct address is
+    only resolved once, which saves lookups when hostnames are repeated.  Every
+    socket is still wrapped in its own stream as by from_socket(), so for
+    numeric addresses this is no quicker than calling connect() repeatedly.
+
+    @param addrs            - list of remote addresses to connect to, the
+                              same address may be repeated.
+    @param local_port_range - optional sequence of local ports such as
+                              range(40000, 50000).  The n-th socket is bound
+                              to the n-th port on the wildcard address before
+                              connecting.  Only for AF_INET and AF_INET6.
+    @return                 - list of DatagramClient instances, in the order
+                              of addrs.
+
+    @raises ValueError - local_port_range is too short or given along with
+                         AF_UNIX addresses.
+    """
+    if local_port_range is not None and len(local_port_range) < len(addrs):
+        raise ValueError(
+            "local_port_range has %d ports for %d addresses"
+            % (len(local_port_range), len(addrs))
+        )
+
+    resolved = await _resolve_many(addrs, passive=False)
+
+    if local_port_range is not None and any(
+        family not in (socket.AF_INET, socket.AF_INET6) for family, _ in resolved
+    ):
+        raise ValueError("local_port_range is only supported for AF_INET and AF_INET6")
+
+    socks = []
+
+    try:
+        for i, (family, sockaddr) in enumerate(resolved):
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            socks.append(sock)
+            sock.setblocking(False)
+            if local_port_range is not None:
+                if family == socket.AF_INET6:
+                    sock.bind(("::", local_port_range[i]))
+                else:
+                    sock.bind(("0.0.0.0", local_port_range[i]))
+            sock.connect(sockaddr)
+    except BaseException:
+        for sock in socks:
+            sock.close()
+        raise
+
+    return await _from_sockets(socks)
+
+
+def close_all(streams):
+    """
+    Close every stream given.
+
+    @param streams  - iterable of DatagramStreams, such as returned by
+                      bind_many() or connect_many().
+    """
+    for stream in streams:
+        stream.close()
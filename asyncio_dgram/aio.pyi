@@ -4,7 +4,25 @@ import pathlib
 import socket
 import sys
 from socket import _Address, _RetAddress
-from typing import Any, Optional, Tuple, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from typing import Protocol as Protocol_
+
+from .stats import Histogram
+
+class _Capture(Protocol_):
+    def record_send(self, data: bytes) -> None: ...
+    def record_recv(self, data: bytes) -> None: ...
 
 class TransportClosed(Exception):
     pass
@@ -12,6 +30,8 @@ class TransportClosed(Exception):
 class DatagramStream:
     # Support type-checking in unittests which mock this
     _drained: asyncio.Event
+    _protocol: Protocol
+    _recvq: asyncio.Queue[tuple[Optional[bytes], Optional[_Address]]]
 
     def __init__(
         self,
@@ -28,9 +48,27 @@ class DatagramStream:
     def peername(self) -> _RetAddress: ...
     @property
     def socket(self) -> asyncio.trsock.TransportSocket: ...
+    @property
+    def recv_flow_stats(self) -> Dict[str, Union[bool, int, float]]: ...
+    def set_recv_queue_limits(
+        self, high: Optional[int] = None, low: Optional[int] = None
+    ) -> None: ...
+    @property
+    def latency_stats(
+        self,
+    ) -> Optional[Dict[str, Dict[str, Optional[Union[int, float]]]]]: ...
+    def enable_latency_stats(self, sample_every: int = 1) -> None: ...
+    def disable_latency_stats(self) -> None: ...
+    def set_capture(self, recorder: Optional[_Capture]) -> None: ...
+    def enable_busy_poll(
+        self, spin: float = 0.0, so_busy_poll: Optional[int] = None
+    ) -> None: ...
+    def disable_busy_poll(self) -> None: ...
     def close(self) -> None: ...
     async def _send(self, data: bytes, addr: Optional[_Address]) -> None: ...
     async def recv(self) -> Tuple[bytes, _Address]: ...
+    def _recv_nowait(self) -> Tuple[bytes, _Address]: ...
+    def _busy_poll(self) -> None: ...
 
 class DatagramServer(DatagramStream):
     async def send(self, data: bytes, addr: _Address) -> None: ...
@@ -38,9 +76,15 @@ class DatagramServer(DatagramStream):
 class DatagramClient(DatagramStream):
     async def send(self, data: bytes) -> None: ...
 
+def _sender(
+    stream: DatagramStream, addr: Optional[_Address] = None
+) -> Callable[[bytes], Awaitable[None]]: ...
+
 class Protocol(asyncio.DatagramProtocol):
     # Support type-checking in unittests which mock this
     _drained: asyncio.Event
+    recv_histogram: Optional[Histogram]
+    capture: Optional[_Capture]
 
     def __init__(
         self,
@@ -54,9 +98,50 @@ class Protocol(asyncio.DatagramProtocol):
     def error_received(self, exc: Exception) -> None: ...
     def pause_writing(self) -> None: ...
     def resume_writing(self) -> None: ...
+    def set_recv_queue_limits(
+        self, high: Optional[int] = None, low: Optional[int] = None
+    ) -> None: ...
+    def recv_consumed(self) -> None: ...
+    def _maybe_resume_reading(self) -> None: ...
+    def recv_flow_stats(self) -> Dict[str, Union[bool, int, float]]: ...
+    def set_recv_histogram(
+        self, histogram: Optional[Histogram], sample_every: int = 1
+    ) -> None: ...
+    def set_ready_callback(self, callback: Optional[Callable[[], None]]) -> None: ...
+
+class _PairTransport(asyncio.DatagramTransport):
+    _peer: Optional[_PairTransport]
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, protocol: asyncio.DatagramProtocol
+    ) -> None: ...
+    def get_protocol(self) -> asyncio.BaseProtocol: ...
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None: ...
+    def is_closing(self) -> bool: ...
+    def close(self) -> None: ...
+    def abort(self) -> None: ...
+    def is_reading(self) -> bool: ...
+    def pause_reading(self) -> None: ...
+    def resume_reading(self) -> None: ...
+    def get_write_buffer_size(self) -> int: ...
+    def get_write_buffer_limits(self) -> Tuple[int, int]: ...
+    def set_write_buffer_limits(
+        self, high: Optional[int] = None, low: Optional[int] = None
+    ) -> None: ...
+    def sendto(self, data: Any, addr: Optional[_Address] = None) -> None: ...
 
 async def bind(
     addr: Union[_Address, pathlib.Path, str], reuse_port: Optional[bool] = None
 ) -> DatagramServer: ...
 async def connect(addr: Union[_Address, pathlib.Path, str]) -> DatagramClient: ...
 async def from_socket(sock: socket.socket) -> Union[DatagramServer, DatagramClient]: ...
+async def pair() -> Tuple[DatagramClient, DatagramClient]: ...
+async def bind_many(
+    addrs: Sequence[Union[_Address, pathlib.Path, str]],
+    reuse_port: Optional[bool] = None,
+) -> List[DatagramServer]: ...
+async def connect_many(
+    addrs: Sequence[Union[_Address, pathlib.Path, str]],
+    local_port_range: Optional[Sequence[int]] = None,
+) -> List[DatagramClient]: ...
+def close_all(streams: Iterable[DatagramStream]) -> None: ...
@@ -0,0 +1,250 @@
+"""
+Recording of the traffic seen by DatagramStreams and replaying it later.
+
+Captures are stored in a simple length-prefixed format: an 8 byte magic
+followed by records consisting of a little-endian header holding the
+nanoseconds since the recording started, the direction (0 received, 1 sent)
+and the payload length, then the payload itself.
+
+A capture can be replayed from the command line:
+
+    python -m asyncio_dgram replay capture.dgram 127.0.0.1:9999
+"""
+
+import argparse
+import asyncio
+import mmap
+import struct
+import time
+
+from .aio import _sender, bind, connect
+
+__all__ = ("Recorder", "read_capture", "replay")
+
+_MAGIC = b"ADGCAP\x00\x01"
+_RECORD = struct.Struct("<QBI")
+
+_RECV = 0
+_SEND = 1
+_DIRECTIONS = {"recv": _RECV, "send": _SEND}
+
+
+class Recorder:
+    """
+    Writes datagrams to a capture file.  Attach it to one or more streams with
+    DatagramStream.set_capture() or attach().
+    """
+
+    def __init__(self, path):
+        """
+        @param path - file to write the capture to, truncated if it exists.
+        """
+        self._file = open(path, "wb")
+        self._file.write(_MAGIC)
+        self._start = time.monotonic_ns()
+        self._streams = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def attach(self, stream):
+        """
+        @param stream   - DatagramStream whose traffic should be recorded until
+                          this recorder is closed.
+        """
+        stream.set_capture(self)
+        self._streams.append(stream)
+
+    def record_recv(self, data):
+        """
+        @param data - datagram received.
+        """
+        self._record(_RECV, data)
+
+    def record_send(self, data):
+        """
+        @param data - datagram sent.
+        """
+        self._record(_SEND, data)
+
+    def close(self):
+        """
+        Detach from all attached streams and close the capture file.
+        """
+        for stream in self._streams:
+            stream.set_capture(None)
+        self._streams.clear()
+        self._file.close()
+
+    def _record(self, direction, data):
+        if self._file.closed:
+            return
+
+        self._file.write(
+            _RECORD.pack(time.monotonic_ns() - self._start, direction, len(data))
+        )
+        self._file.write(data)
+
+
+def _records(buf):
+    """
+    @param buf  - capture file contents.
+    @return     - generator of (timestamp ns, direction, start, end) where start
+                  and end are the offsets of the payload in buf.
+    """
+    if buf[: len(_MAGIC)] != _MAGIC:
+        raise ValueError("not a capture file")
+
+    offset = len(_MAGIC)
+    size = len(buf)
+    while offset < size:
+        if offset + _RECORD.size > size:
+            raise ValueError("truncated capture record at offset %d" % (offset,))
+
+        ts, direction, length = _RECORD.unpack_from(buf, offset)
+        offset += _RECORD.size
+        if offset + length > size:
+            raise ValueError("truncated capture payload at offset %d" % (offset,))
+
+        yield ts, direction, offset, offset + length
+        offset += length
+
+
+def read_capture(path):
+    """
+    @param path - capture file to read.
+    @return     - generator of (seconds since capture start, direction, data)
+                  tuples, direction being either "recv" or "send".
+    """
+    names = {v: k for k, v in _DIRECTIONS.items()}
+    with open(path, "rb") as f:
+        buf = f.read()
+
+    for ts, direction, start, end in _records(buf):
+        yield ts / 1e9, names[direction], buf[start:end]
+
+
+async def replay(path, stream, addr=None, rate=1.0, direction="recv"):
+    """
+    Send the datagrams in a capture through a stream, pacing them as they were
+    recorded.  The capture is memory mapped and payloads are handed to the
+    transport without being copied.
+
+    @param path         - capture file to replay.
+    @param stream       - DatagramStream to send through.
+    @param addr         - destination address, required for a DatagramServer.
+    @param rate         - speed multiplier, 2.0 replays twice as fast as
+                          recorded.  0 sends everything as fast as possible.
+    @param direction    - which recorded datagrams to send, "recv", "send" or
+                          None for both.
+    @return             - number of datagrams sent.
+    """
+    if rate < 0:
+        raise ValueError("rate must be >= 0, not %r" % (rate,))
+
+    if direction is not None and direction not in _DIRECTIONS:
+        raise ValueError("direction must be one of recv, send or None")
+
+    send = _sender(stream, addr)
+    wanted = None if direction is None else _DIRECTIONS[direction]
+    sent = 0
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            first = None
+            start_ns = time.monotonic_ns()
+            for ts, d, start, end in _records(mm):
+                if wanted is not None and d != wanted:
+                    continue
+
+                if first is None:
+                    first = ts
+
+                if rate:
+                    delay = (ts - first) / rate - (time.monotonic_ns() - start_ns)
+                    # Sleeping has millisecond granularity at best, anything
+                    # shorter is sent right away and caught up on later.
+                    if delay > 1e6:
+                        await asyncio.sleep(delay / 1e9)
+
+                with view[start:end] as data:
+                    await send(data)
+                sent += 1
+        finally:
+            view.release()
+
+    return sent
+
+
+def _parse_addr(value):
+    """
+    @param value    - host:port, [ipv6]:port or a path for AF_UNIX.
+    """
+    host, sep, port = value.rpartition(":")
+    if not sep or not port.isdigit():
+        return value
+
+    return host.strip("[]"), int(port)
+
+
+async def _replay_main(args):
+    addr = _parse_addr(args.addr)
+    if args.bind is not None:
+        stream = await bind(_parse_addr(args.bind))
+        dest = addr
+    else:
+        stream = await connect(addr)
+        dest = None
+
+    try:
+        start = time.monotonic()
+        sent = await replay(
+            args.capture, stream, dest, rate=args.rate, direction=args.direction
+        )
+        elapsed = time.monotonic() - start
+    finally:
+        stream.close()
+
+    print(
+        "Sent %d datagrams in %.3fs (%.0f/s)"
+        % (sent, elapsed, sent / elapsed if elapsed else 0)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m asyncio_dgram",
+        description="Tools for asyncio_dgram capture files",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("replay", help="send a capture to an address")
+    p.add_argument("capture", help="capture file")
+    p.add_argument("addr", help="destination, host:port or AF_UNIX path")
+    p.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="speed multiplier, 0 for as fast as possible (default: 1.0)",
+    )
+    p.add_argument(
+        "--direction",
+        choices=("recv", "send", "both"),
+        default="recv",
+        help="which recorded datagrams to send (default: recv)",
+    )
+    p.add_argument(
+        "--bind",
+        metavar="ADDR",
+        help="bind to this local address rather than connecting",
+    )
+
+    args = parser.parse_args(argv)
+    if args.direction == "both":
+        args.direction = None
+
+    asyncio.run(_replay_main(args))
@@ -0,0 +1,36 @@
+import argparse
+import os
+from socket import _Address
+from types import TracebackType
+from typing import Iterator, Optional, Sequence, Tuple, Type, Union
+
+from .aio import DatagramStream
+
+_Path = Union[str, "os.PathLike[str]"]
+
+class Recorder:
+    def __init__(self, path: _Path) -> None: ...
+    def __enter__(self) -> Recorder: ...
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None: ...
+    def attach(self, stream: DatagramStream) -> None: ...
+    def record_recv(self, data: bytes) -> None: ...
+    def record_send(self, data: bytes) -> None: ...
+    def close(self) -> None: ...
+    def _record(self, direction: int, data: bytes) -> None: ...
+
+def read_capture(path: _Path) -> Iterator[Tuple[float, str, bytes]]: ...
+async def replay(
+    path: _Path,
+    stream: DatagramStream,
+    addr: Optional[_Address] = None,
+    rate: float = 1.0,
+    direction: Optional[str] = "recv",
+) -> int: ...
+def _parse_addr(value: str) -> Union[Tuple[str, int], str]: ...
+async def _replay_main(args: argparse.Namespace) -> None: ...
+def main(argv: Optional[Sequence[str]] = None) -> None: ...
@@ -0,0 +1,169 @@
+import asyncio
+import struct
+
+from .aio import TransportClosed, _sender
+
+__all__ = ("CoalescingWriter", "split_messages", "iter_messages")
+
+# Each message within a datagram is prefixed by its length.
+_HEADER = struct.Struct("!H")
+# Largest datagram which can hold a single message of the longest length the
+# header can express.
+_MAX_MTU = 0xFFFF + _HEADER.size
+
+
+class CoalescingWriter:
+    """
+    Packs small messages into as few datagrams as possible.  Messages are
+    buffered until either the next one would no longer fit within mtu bytes or
+    flush_interval seconds have passed since the first buffered message, then
+    sent as a single datagram.  The receiving end splits them up again with
+    split_messages() or iter_messages().
+
+    A writer may be shared by many tasks, messages are sent in the order
+    send() was called.  Errors from timed flushes are raised by the next call
+    to send() or flush().
+    """
+
+    def __init__(self, stream, mtu=1400, flush_interval=0.01, addr=None):
+        """
+        @param stream           - DatagramStream to send through.
+        @param mtu              - maximum size of the datagrams sent, at most
+                                  65537 as message lengths are 16 bits.
+        @param flush_interval   - maximum seconds a message is buffered.
+        @param addr             - destination address, required if stream is a
+                                  DatagramServer.
+        """
+        if not _HEADER.size < mtu <= _MAX_MTU:
+            raise ValueError(
+                "mtu must be > %d and <= %d, not %r" % (_HEADER.size, _MAX_MTU, mtu)
+            )
+
+        self._send = _sender(stream, addr)
+
+        self._mtu = mtu
+        self._flush_interval = flush_interval
+        self._buf = bytearray()
+        self._timer = None
+        self._flush_task = None
+        self._exc = None
+
+        # Held while the buffer is being added to or sent, so concurrent
+        # senders cannot overfill a datagram or reorder messages.
+        self._lock = asyncio.Lock()
+
+    async def send(self, data):
+        """
+        @param data - message to send, at most mtu - 2 bytes.
+        """
+        self._raise_pending()
+
+        size = _HEADER.size + len(data)
+        if size > self._mtu:
+            raise ValueError(
+                "message of %d bytes does not fit in mtu of %d" % (len(data), self._mtu)
+            )
+
+        async with self._lock:
+            if len(self._buf) + size > self._mtu:
+                await self._flush()
+
+            self._buf += _HEADER.pack(len(data))
+            self._buf += data
+
+            if len(self._buf) + _HEADER.size >= self._mtu:
+                await self._flush()
+            elif self._timer is None:
+                loop = asyncio.get_event_loop()
+                self._timer = loop.call_later(self._flush_interval, self._on_timer)
+
+    async def flush(self):
+        """
+        Send any buffered messages immediately.
+        """
+        self._raise_pending()
+
+        async with self._lock:
+            await self._flush()
+
+    async def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._buf:
+            return
+
+        data = bytes(self._buf)
+        self._buf.clear()
+        await self._send(data)
+
+    async def close(self):
+        """
+        Flush any buffered messages and stop the flush timer.  The stream is
+        left open.
+        """
+        await self.flush()
+        if self._flush_task is not None:
+            await self._flush_task
+            self._raise_pending()
+
+    def _raise_pending(self):
+        if self._exc is not None:
+            exc, self._exc = self._exc, None
+            raise exc
+
+    def _on_timer(self):
+        self._timer = None
+        self._flush_task = asyncio.ensure_future(self._timed_flush())
+
+    async def _timed_flush(self):
+        try:
+            await self.flush()
+        except Exception as exc:
+            self._exc = exc
+
+
+def split_messages(data):
+    """
+    @param data - datagram written by a CoalescingWriter.
+    @return     - list of the messages it contains.
+
+    @raises ValueError - data is not correctly framed.
+    """
+    messages = []
+    offset = 0
+    size = len(data)
+
+    while offset < size:
+        if offset + _HEADER.size > size:
+            raise ValueError("truncated message header at offset %d" % (offset,))
+
+        (length,) = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        end = offset + length
+        if end > size:
+            raise ValueError("truncated message at offset %d" % (offset,))
+
+        messages.append(data[offset:end])
+        offset = end
+
+    return messages
+
+
+async def iter_messages(stream):
+    """
+    Receive datagrams written by a CoalescingWriter from a stream until it is
+    closed.
+
+    @param stream   - DatagramStream to receive from.
+    @return         - async generator of (message, addr) tuples.
+    """
+    while True:
+        try:
+            data, addr = await stream.recv()
+        except TransportClosed:
+            return
+
+        for message in split_messages(data):
+            yield message, addr
@@ -0,0 +1,19 @@
+from socket import _Address
+from typing import AsyncIterator, List, Optional, Tuple
+
+from .aio import DatagramStream
+
+class CoalescingWriter:
+    def __init__(
+        self,
+        stream: DatagramStream,
+        mtu: int = 1400,
+        flush_interval: float = 0.01,
+        addr: Optional[_Address] = None,
+    ) -> None: ...
+    async def send(self, data: bytes) -> None: ...
+    async def flush(self) -> None: ...
+    async def close(self) -> None: ...
+
+def split_messages(data: bytes) -> List[bytes]: ...
+def iter_messages(stream: DatagramStream) -> AsyncIterator[Tuple[bytes, _Address]]: ...
@@ -0,0 +1,238 @@
+import bisect
+import collections
+import random
+import struct
+import time
+
+from .aio import _sender
+
+__all__ = ("FragmentingWriter", "Reassembler")
+
+# Every fragment starts with the message id, the total length of the message
+# and the offset of the fragment within it.
+_HEADER = struct.Struct("!III")
+_HEADER_SIZE = _HEADER.size
+
+
+class FragmentingWriter:
+    """
+    Splits messages larger than the path MTU into datagrams of at most mtu
+    bytes so IP fragmentation is never needed.  The receiving end puts them
+    back together with a Reassembler.
+    """
+
+    def __init__(self, stream, mtu=1400, addr=None):
+        """
+        @param stream   - DatagramStream to send through.
+        @param mtu      - maximum size of the datagrams sent, including the 12
+                          byte fragment header.
+        @param addr     - destination address, required if stream is a
+                          DatagramServer.
+        """
+        if mtu <= _HEADER_SIZE:
+            raise ValueError("mtu must be > %d, not %r" % (_HEADER_SIZE, mtu))
+
+        self._send = _sender(stream, addr)
+
+        self._chunk = mtu - _HEADER_SIZE
+        self._next_id = random.getrandbits(32)
+
+    async def send(self, data):
+        """
+        @param data - message to send, less than 4GiB.
+        """
+        total = len(data)
+        if total > 0xFFFFFFFF:
+            raise ValueError("message of %d bytes is too large" % (total,))
+
+        msg_id = self._next_id
+        self._next_id = (msg_id + 1) & 0xFFFFFFFF
+
+        view = memoryview(data)
+        offset = 0
+        while True:
+            end = min(offset + self._chunk, total)
+            await self._send(_HEADER.pack(msg_id, total, offset) + view[offset:end])
+            offset = end
+            if offset >= total:
+                break
+
+
+class Reassembler:
+    """
+    Receives messages sent by a FragmentingWriter.  Each message is
+    reassembled in place into a buffer allocated once its first fragment
+    arrives, which is then returned as is.
+
+    Memory is bounded: messages still missing fragments after timeout seconds
+    are dropped, as are the oldest incomplete messages once max_pending bytes
+    are being reassembled.  Datagrams which are not valid fragments, including
+    fragments overlapping others of the same message, are ignored.  Counts of
+    each are kept in stats.  Fragments arriving within timeout seconds of
+    their message completing, such as duplicates, are dropped, for up to
+    max_completed of the most recently completed messages.
+    """
+
+    def __init__(
+        self,
+        stream,
+        max_message_size=16 * 1024 * 1024,
+        max_pending=64 * 1024 * 1024,
+        timeout=5.0,
+        max_completed=16384,
+    ):
+        """
+        @param stream           - DatagramStream to receive from.
+        @param max_message_size - largest message accepted, in bytes.
+        @param max_pending      - maximum bytes of incomplete messages held.
+        @param timeout          - seconds after its first fragment an
+                                  incomplete message is dropped.
+        @param max_completed    - maximum number of completed messages whose
+                                  late fragments are dropped.
+        """
+        self._stream = stream
+        self._max_message_size = max_message_size
+        self._max_pending = max_pending
+        self._timeout = timeout
+        self._max_completed = max_completed
+
+        # (addr, id) -> [buffer, bytes received, sorted (start, end) of the
+        # fragments received, started], oldest first.
+        self._partial = collections.OrderedDict()
+        self._pending = 0
+
+        # (addr, id) -> time completed, oldest first.
+        self._completed = collections.OrderedDict()
+
+        self.stats = {"completed": 0, "expired": 0, "evicted": 0, "invalid": 0}
+
+    @property
+    def pending(self):
+        """
+        Bytes allocated for messages being reassembled.
+        """
+        return self._pending
+
+    async def recv(self):
+        """
+        Receive the next complete message.
+
+        @return - tuple of a bytearray holding the message and the address it
+                  was received from.
+
+        @raises TransportClosed - DatagramTransport closed.
+        """
+        while True:
+            data, addr = await self._stream.recv()
+            message = self._feed(data, addr, time.monotonic())
+            if message is not None:
+                return message, addr
+
+    def _feed(self, data, addr, now):
+        """
+        @return - the completed message if data was its last fragment.
+        """
+        self._expire(now)
+
+        size = len(data) - _HEADER_SIZE
+        if size < 0:
+            self.stats["invalid"] += 1
+            return None
+
+        payload = memoryview(data)[_HEADER_SIZE:]
+
+        msg_id, total, offset = _HEADER.unpack_from(data)
+        if (
+            total > self._max_message_size
+            or offset + size > total
+            or (size == 0 and total > 0)
+        ):
+            self.stats["invalid"] += 1
+            return None
+
+        key = (addr, msg_id)
+        if key in self._completed:
+            return None
+
+        entry = self._partial.get(key)
+        if entry is None:
+            if size == total:
+                # Unfragmented, no reassembly needed.
+                self.stats["completed"] += 1
+                return bytearray(payload)
+
+            if not self._reserve(total):
+                self.stats["evicted"] += 1
+                return None
+
+            entry = [bytearray(total), 0, [], now]
+            self._partial[key] = entry
+        elif len(entry[0]) != total:
+            self.stats["invalid"] += 1
+            return None
+
+        buf, received, ranges, _ = entry
+        end = offset + size
+
+        i = bisect.bisect_left(ranges, (offset, end))
+        if i < len(ranges) and ranges[i] == (offset, end):
+            # Duplicate.
+            return None
+
+        if (i > 0 and ranges[i - 1][1] > offset) or (
+            i < len(ranges) and ranges[i][0] < end
+        ):
+            self.stats["invalid"] += 1
+            return None
+
+        ranges.insert(i, (offset, end))
+        buf[offset:end] = payload
+        received += size
+        entry[1] = received
+
+        if received < total:
+            return None
+
+        del self._partial[key]
+        self._pending -= total
+        self._completed[key] = now
+        if len(self._completed) > self._max_completed:
+            self._completed.popitem(last=False)
+        self.stats["completed"] += 1
+        return buf
+
+    def _reserve(self, size):
+        """
+        Make room for a new message of size bytes, evicting the oldest
+        incomplete messages as needed.
+
+        @return - False if the message can never fit.
+        """
+        if size > self._max_pending:
+            return False
+
+        while self._pending + size > self._max_pending:
+            _, (buf, _, _, _) = self._partial.popitem(last=False)
+            self._pending -= len(buf)
+            self.stats["evicted"] += 1
+
+        self._pending += size
+        return True
+
+    def _expire(self, now):
+        deadline = now - self._timeout
+        while self._partial:
+            key, entry = next(iter(self._partial.items()))
+            if entry[3] > deadline:
+                break
+
+            del self._partial[key]
+            self._pending -= len(entry[0])
+            self.stats["expired"] += 1
+
+        while self._completed:
+            key, completed = next(iter(self._completed.items()))
+            if completed > deadline:
+                break
+
+            del self._completed[key]
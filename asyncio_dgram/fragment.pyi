@@ -0,0 +1,28 @@
+from socket import _Address
+from typing import Dict, Optional, Tuple
+
+from .aio import DatagramStream
+
+class FragmentingWriter:
+    def __init__(
+        self, stream: DatagramStream, mtu: int = 1400, addr: Optional[_Address] = None
+    ) -> None: ...
+    async def send(self, data: bytes) -> None: ...
+
+class Reassembler:
+    stats: Dict[str, int]
+
+    def __init__(
+        self,
+        stream: DatagramStream,
+        max_message_size: int = ...,
+        max_pending: int = ...,
+        timeout: float = 5.0,
+        max_completed: int = 16384,
+    ) -> None: ...
+    @property
+    def pending(self) -> int: ...
+    async def recv(self) -> Tuple[bytearray, _Address]: ...
+    def _feed(
+        self, data: bytes, addr: Optional[_Address], now: float
+    ) -> Optional[bytearray]: ...
@@ -0,0 +1,150 @@
+import asyncio
+import functools
+
+from .aio import TransportClosed
+
+__all__ = ("StreamSet",)
+
+
+class StreamSet:
+    """
+    A set of DatagramStreams that a single task can receive from, rather than
+    running a task per stream each awaiting recv().  The protocols of the
+    member streams mark them ready as datagrams arrive, so receiving only
+    visits streams that have something queued.
+
+    A stream can belong to at most one StreamSet and should not have recv()
+    called on it directly while it is a member.  Streams whose transport is
+    closed are removed from the set once everything queued before the close
+    has been received.
+
+    Errors noticed by a member stream, such as ConnectionRefusedError, are
+    raised by recv() just as DatagramStream.recv() would, the stream stays in
+    the set.  If datagrams were already gathered for the batch, they are
+    returned first and the error is raised by the following call.
+    """
+
+    def __init__(self, streams=()):
+        """
+        @param streams  - initial DatagramStreams in the set.
+        """
+        self._streams = set()
+        # Insertion ordered, used as an ordered set of ready streams.
+        self._ready = {}
+        self._wakeup = asyncio.Event()
+
+        # Error from a member stream held back while a batch was returned.
+        self._exc = None
+
+        for stream in streams:
+            self.add(stream)
+
+    def __len__(self):
+        return len(self._streams)
+
+    def __contains__(self, stream):
+        return stream in self._streams
+
+    def __iter__(self):
+        return iter(list(self._streams))
+
+    def add(self, stream):
+        """
+        @param stream   - DatagramStream to add to the set.
+
+        @raises ValueError - stream already belongs to another StreamSet.
+        """
+        if stream in self._streams:
+            return
+
+        stream._protocol.set_ready_callback(functools.partial(self._mark_ready, stream))
+        self._streams.add(stream)
+
+        if _has_pending(stream):
+            self._mark_ready(stream)
+
+    def discard(self, stream):
+        """
+        @param stream   - DatagramStream to remove from the set, if present.
+        """
+        if stream not in self._streams:
+            return
+
+        self._streams.remove(stream)
+        self._ready.pop(stream, None)
+        stream._protocol.set_ready_callback(None)
+
+    def close(self):
+        """
+        Close every stream in the set and empty it.
+        """
+        for stream in list(self._streams):
+            self.discard(stream)
+            stream.close()
+
+    async def recv(self, max_batch=64):
+        """
+        Wait until at least one stream in the set has received data.
+
+        @param max_batch    - maximum number of datagrams to return.
+        @return             - list of (stream, data, addr) tuples, in the order
+                              received for any single stream.  Streams are
+                              visited round-robin so a busy stream cannot
+                              starve the others.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1, not %r" % (max_batch,))
+
+        if self._exc is not None:
+            exc, self._exc = self._exc, None
+            raise exc
+
+        while True:
+            while not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            batch = []
+            for stream in list(self._ready):
+                if len(batch) == max_batch:
+                    break
+
+                del self._ready[stream]
+                try:
+                    _ = stream.exception
+                except Exception as exc:
+                    if _has_pending(stream):
+                        self._ready[stream] = None
+                    if not batch:
+                        raise
+                    self._exc = exc
+                    break
+
+                while len(batch) < max_batch:
+                    try:
+                        data, addr = stream._recv_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    except TransportClosed:
+                        self.discard(stream)
+                        break
+
+                    batch.append((stream, data, addr))
+                else:
+                    # Out of room, anything left goes to the back of the line.
+                    if _has_pending(stream):
+                        self._ready[stream] = None
+
+            if batch:
+                return batch
+
+    def _mark_ready(self, stream):
+        self._ready[stream] = None
+        self._wakeup.set()
+
+
+def _has_pending(stream):
+    """
+    @return - True if stream has datagrams or errors waiting to be received.
+    """
+    return not stream._recvq.empty() or not stream._excq.empty()
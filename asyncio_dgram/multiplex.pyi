@@ -0,0 +1,17 @@
+from socket import _Address
+from typing import Iterable, Iterator, List, Tuple
+
+from .aio import DatagramStream
+
+class StreamSet:
+    def __init__(self, streams: Iterable[DatagramStream] = ()) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, stream: object) -> bool: ...
+    def __iter__(self) -> Iterator[DatagramStream]: ...
+    def add(self, stream: DatagramStream) -> None: ...
+    def discard(self, stream: DatagramStream) -> None: ...
+    def close(self) -> None: ...
+    async def recv(
+        self, max_batch: int = 64
+    ) -> List[Tuple[DatagramStream, bytes, _Address]]: ...
+    def _mark_ready(self, stream: DatagramStream) -> None: ...
@@ -0,0 +1,113 @@
+import socket
+
+from .aio import from_socket
+
+__all__ = ("PeerAcceptor",)
+
+# Fewest peers held before closed streams are pruned by accept().
+_MIN_PRUNE = 64
+
+
+class PeerAcceptor:
+    """
+    Hands out a dedicated DatagramClient for every peer that sends to a
+    DatagramServer.  When the first datagram from a new peer arrives, a socket
+    bound to the same local address as the server and connected to the peer is
+    created.  From then on the kernel delivers that peer's datagrams straight
+    to the connected socket, spreading peers across sockets and sparing the
+    per-datagram address handling of a shared server socket.
+
+    The server must be an AF_INET or AF_INET6 stream bound with
+    reuse_port=True.  Datagrams which still reach the server from a known peer,
+    such as those that arrived before its socket was connected, are forwarded
+    to that peer's stream.
+    """
+
+    def __init__(self, server):
+        """
+        @param server   - DatagramServer bound with reuse_port=True.
+
+        @raises ValueError - server cannot share its address.
+        """
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise ValueError("SO_REUSEPORT is not supported on this platform")
+
+        sock = server.socket
+        if sock.family not in (socket.AF_INET, socket.AF_INET6):
+            raise ValueError("server must be AF_INET or AF_INET6")
+
+        if not sock.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT):
+            raise ValueError("server must be bound with reuse_port=True")
+
+        self._server = server
+        self._family = sock.family
+        self._peers = {}
+
+        # Closed streams are pruned whenever this many peers are held, so
+        # accept() alone keeps memory bounded.
+        self._prune_at = _MIN_PRUNE
+
+    @property
+    def peers(self):
+        """
+        Dictionary of peer address to the DatagramClient for that peer, for
+        peers whose stream is still open.  Closed streams are forgotten.
+        """
+        self._prune()
+        return dict(self._peers)
+
+    async def accept(self):
+        """
+        Wait for a datagram from a peer without an open stream.
+
+        @return - DatagramClient connected to the new peer, the datagram that
+                  triggered its creation is waiting to be received from it.
+
+        @raises TransportClosed - The server was closed.
+        """
+        while True:
+            data, addr = await self._server.recv()
+
+            stream = self._peers.get(addr)
+            if stream is not None:
+                if not stream._transport.is_closing():
+                    stream._protocol.datagram_received(data, addr)
+                    continue
+
+                del self._peers[addr]
+
+            stream = await self._connect(addr)
+            stream._protocol.datagram_received(data, addr)
+
+            if len(self._peers) >= self._prune_at:
+                self._prune()
+            self._peers[addr] = stream
+            return stream
+
+    def close(self):
+        """
+        Close the streams of all peers.  The server is left open.
+        """
+        for stream in self._peers.values():
+            stream.close()
+        self._peers.clear()
+
+    def _prune(self):
+        self._peers = {
+            addr: stream
+            for addr, stream in self._peers.items()
+            if not stream._transport.is_closing()
+        }
+        self._prune_at = max(_MIN_PRUNE, 2 * len(self._peers))
+
+    async def _connect(self, addr):
+        sock = socket.socket(self._family, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind(self._server.sockname)
+            sock.connect(addr)
+            sock.setblocking(False)
+            return await from_socket(sock)
+        except BaseException:
+            sock.close()
+            raise
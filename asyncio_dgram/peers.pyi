@@ -0,0 +1,12 @@
+from socket import _RetAddress
+from typing import Dict
+
+from .aio import DatagramClient, DatagramServer
+
+class PeerAcceptor:
+    def __init__(self, server: DatagramServer) -> None: ...
+    @property
+    def peers(self) -> Dict[_RetAddress, DatagramClient]: ...
+    async def accept(self) -> DatagramClient: ...
+    def close(self) -> None: ...
+    async def _connect(self, addr: _RetAddress) -> DatagramClient: ...
@@ -0,0 +1,230 @@
+import asyncio
+from multiprocessing import shared_memory
+
+from .aio import TransportClosed
+
+__all__ = ("DecodePipeline",)
+
+
+def _decode_batch(decode, name, spans):
+    """
+    Run in the executor: decode every datagram of a batch from shared memory.
+
+    @param decode   - callable taking the bytes of a datagram.
+    @param name     - name of the shared memory block holding the batch.
+    @param spans    - list of (start, end) offsets of each datagram.
+    @return         - list of decoded results, in order.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        buf = shm.buf
+        results = [decode(bytes(buf[start:end])) for start, end in spans]
+        del buf
+        return results
+    finally:
+        shm.close()
+
+
+class DecodePipeline:
+    """
+    Decodes the datagrams received on a stream in an executor, normally a
+    concurrent.futures.ProcessPoolExecutor, so CPU bound decoding does not
+    hold up the event loop.  Whatever is queued on the stream is gathered into
+    batches which are copied into shared memory blocks, so payloads are never
+    pickled, and decoded by the executor.
+
+    Iterate over the pipeline to get (result, addr) for each datagram:
+
+        async for result, addr in DecodePipeline(server, json.loads, pool):
+            ...
+
+    Iteration ends once the stream is closed and everything received has
+    been decoded.  Exceptions raised by decode are raised by the iteration.
+    """
+
+    def __init__(
+        self,
+        stream,
+        decode,
+        executor,
+        batch_size=256,
+        buffer_size=1024 * 1024,
+        max_pending=None,
+        ordered=True,
+    ):
+        """
+        @param stream       - DatagramStream to receive from.
+        @param decode       - picklable callable taking the bytes of a datagram
+                              and returning the decoded result.
+        @param executor     - concurrent.futures.Executor to decode in.
+        @param batch_size   - maximum number of datagrams per batch.
+        @param buffer_size  - size of each shared memory block, a batch ends
+                              early once its block is full.
+        @param max_pending  - maximum number of batches submitted to the
+                              executor and not yet consumed, defaults to
+                              twice the executor's workers.  Once reached no
+                              more datagrams are taken off of the stream.
+        @param ordered      - if True results are produced in the order
+                              datagrams were received, otherwise batches are
+                              produced as soon as they are decoded.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1, not %r" % (batch_size,))
+
+        if max_pending is None:
+            max_pending = 2 * getattr(executor, "_max_workers", 1)
+
+        self._stream = stream
+        self._decode = decode
+        self._executor = executor
+        self._batch_size = batch_size
+        self._buffer_size = buffer_size
+        self._max_pending = max_pending
+        self._ordered = ordered
+
+        # All shared memory blocks created and those not holding a batch.
+        self._blocks = set()
+        self._free = []
+
+        # Datagram taken off of the stream that did not fit in the last batch.
+        self._carry = None
+
+    def __aiter__(self):
+        return self._results()
+
+    async def _results(self):
+        ready = asyncio.Queue()
+        pending = asyncio.Semaphore(self._max_pending)
+        reader = asyncio.ensure_future(self._read(ready, pending))
+
+        try:
+            while True:
+                item = await ready.get()
+                if item is None:
+                    break
+
+                future, shm, addrs = item
+                try:
+                    results = await future
+                finally:
+                    self._release(shm)
+                    pending.release()
+
+                for result, addr in zip(results, addrs):
+                    yield result, addr
+
+            # Surface unexpected errors from the reader.
+            await reader
+        finally:
+            reader.cancel()
+            for shm in self._blocks:
+                shm.close()
+                shm.unlink()
+            self._blocks.clear()
+            self._free.clear()
+
+    async def _read(self, ready, pending):
+        loop = asyncio.get_event_loop()
+        outstanding = set()
+
+        try:
+            while True:
+                await pending.acquire()
+                try:
+                    batch = await self._next_batch()
+                except TransportClosed:
+                    pending.release()
+                    break
+
+                shm, spans, addrs = batch
+                future = loop.run_in_executor(
+                    self._executor, _decode_batch, self._decode, shm.name, spans
+                )
+                item = (future, shm, addrs)
+
+                if self._ordered:
+                    ready.put_nowait(item)
+                else:
+
+                    def done(f, item=item):
+                        outstanding.discard(f)
+                        ready.put_nowait(item)
+
+                    outstanding.add(future)
+                    future.add_done_callback(done)
+
+            if outstanding:
+                await asyncio.wait(outstanding)
+        finally:
+            ready.put_nowait(None)
+
+    async def _next_batch(self):
+        """
+        Wait for at least one datagram and copy everything queued, up to the
+        batch limits, into a shared memory block.
+
+        @return - tuple of the block, the (start, end) of each datagram within
+                  it and the address of each datagram.
+        """
+        if self._carry is not None:
+            data, addr = self._carry
+            self._carry = None
+        else:
+            data, addr = await self._stream.recv()
+
+        shm = self._acquire(len(data))
+        buf = shm.buf
+
+        spans = []
+        addrs = []
+        offset = 0
+        try:
+            while True:
+                end = offset + len(data)
+                buf[offset:end] = data
+                spans.append((offset, end))
+                addrs.append(addr)
+                offset = end
+
+                if len(spans) == self._batch_size:
+                    break
+
+                try:
+                    data, addr = self._stream._recv_nowait()
+                except (asyncio.QueueEmpty, TransportClosed):
+                    # A close is noticed by the next recv().
+                    break
+
+                if offset + len(data) > shm.size:
+                    self._carry = (data, addr)
+                    break
+        finally:
+            del buf
+
+        return shm, spans, addrs
+
+    def _acquire(self, size):
+        """
+        @param size - minimum size of the block.
+        @return     - a free shared memory block of at least size bytes.
+        """
+        if self._free and self._free[-1].size >= size:
+            return self._free.pop()
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, self._buffer_size))
+        self._blocks.add(shm)
+        return shm
+
+    def _release(self, shm):
+        """
+        @param shm  - block no longer needed by a batch.
+        """
+        if shm not in self._blocks:
+            return
+
+        if len(self._free) < self._max_pending:
+            self._free.append(shm)
+        else:
+            self._blocks.discard(shm)
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,22 @@
+import concurrent.futures
+from socket import _Address
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from .aio import DatagramStream
+
+def _decode_batch(
+    decode: Callable[[bytes], Any], name: str, spans: List[Tuple[int, int]]
+) -> List[Any]: ...
+
+class DecodePipeline:
+    def __init__(
+        self,
+        stream: DatagramStream,
+        decode: Callable[[bytes], Any],
+        executor: concurrent.futures.Executor,
+        batch_size: int = 256,
+        buffer_size: int = ...,
+        max_pending: Optional[int] = None,
+        ordered: bool = True,
+    ) -> None: ...
+    def __aiter__(self) -> AsyncIterator[Tuple[Any, _Address]]: ...
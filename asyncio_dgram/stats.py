@@ -0,0 +1,102 @@
+__all__ = ("Histogram",)
+
+# Each power of two is split into 2**_SUB_BITS linear buckets, giving a
+# relative error of at most 1/2**_SUB_BITS for any recorded value.
+_SUB_BITS = 3
+_SUB_COUNT = 1 << _SUB_BITS
+_BUCKETS = (64 - _SUB_BITS + 1) * _SUB_COUNT
+
+
+def _bucket(value):
+    if value < _SUB_COUNT:
+        return value
+
+    shift = value.bit_length() - _SUB_BITS - 1
+    return (shift + 1) * _SUB_COUNT + (value >> shift) - _SUB_COUNT
+
+
+def _bucket_high(index):
+    if index < _SUB_COUNT:
+        return index
+
+    shift = index // _SUB_COUNT - 1
+    mantissa = index % _SUB_COUNT + _SUB_COUNT
+    return ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    Fixed memory, log-bucketed histogram of durations.  Values are recorded as
+    integer nanoseconds and reported in seconds.  Percentiles are accurate to
+    within 12.5% of the true value.
+    """
+
+    def __init__(self):
+        self._counts = [0] * _BUCKETS
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all recorded values.
+        """
+        for i in range(_BUCKETS):
+            self._counts[i] = 0
+
+        self.count = 0
+        self._total = 0
+        self._min = None
+        self._max = 0
+
+    def record(self, ns):
+        """
+        @param ns   - duration in nanoseconds, negative values are clamped to 0.
+        """
+        if ns < 0:
+            ns = 0
+
+        self._counts[_bucket(ns)] += 1
+        self.count += 1
+        self._total += ns
+        if self._min is None or ns < self._min:
+            self._min = ns
+        if ns > self._max:
+            self._max = ns
+
+    def percentile(self, pct):
+        """
+        @param pct  - percentile in the range [0, 100].
+        @return     - upper bound in seconds of the bucket holding the given
+                      percentile, or None if nothing has been recorded.
+        """
+        if not 0 <= pct <= 100:
+            raise ValueError("percentile must be between 0 and 100, not %r" % (pct,))
+
+        if self.count == 0:
+            return None
+
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_high(index), self._max) / 1e9
+
+        return self._max / 1e9
+
+    def to_dict(self, percentiles=(50, 90, 99, 99.9)):
+        """
+        @param percentiles  - percentiles to include.
+        @return             - dictionary with the count and the min, max, mean
+                              and requested percentiles in seconds.  The
+                              percentile keys are named p<pct>, i.e. p50, p99.9
+        """
+        d = {
+            "count": self.count,
+            "min": None if self._min is None else self._min / 1e9,
+            "max": self._max / 1e9 if self.count else None,
+            "mean": self._total / self.count / 1e9 if self.count else None,
+        }
+        for pct in percentiles:
+            d["p%s" % (pct,)] = self.percentile(pct)
+
+        return d
@@ -0,0 +1,12 @@
+from typing import Dict, Iterable, Optional, Union
+
+class Histogram:
+    count: int
+
+    def __init__(self) -> None: ...
+    def reset(self) -> None: ...
+    def record(self, ns: int) -> None: ...
+    def percentile(self, pct: float) -> Optional[float]: ...
+    def to_dict(
+        self, percentiles: Iterable[float] = ...
+    ) -> Dict[str, Optional[Union[int, float]]]: ...
@@ -540,3 +540,297 @@ async def test_bind_reuse_port() -> None:
     await asyncio.gather(
         *[use_socket(addr_2, reuse_port=True) for _ in range(clients_count)]
     )
+
+
+@pytest.mark.asyncio
+async def test_pair() -> None:
+    a, b = await asyncio_dgram.pair()
+
+    assert isinstance(a, asyncio_dgram.aio.DatagramClient)
+    assert isinstance(b, asyncio_dgram.aio.DatagramClient)
+    assert a.sockname is None
+    assert a.peername is None
+
+    await a.send(b"hi")
+    data, addr = await b.recv()
+    assert data == b"hi"
+    assert addr is None
+
+    await b.send(b"bye")
+    data, addr = await a.recv()
+    assert data == b"bye"
+    assert addr is None
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(a.recv(), 0.05)
+
+    b.close()
+    with pytest.raises(asyncio_dgram.TransportClosed):
+        await b.recv()
+
+    await a.send(b"lost")
+    await asyncio.sleep(0)
+    with pytest.raises(ConnectionRefusedError):
+        await a.send(b"lost")
+
+    a.close()
+    with pytest.raises(asyncio_dgram.TransportClosed):
+        await a.send(b"junk")
+
+
+@pytest.mark.asyncio
+async def test_pair_backpressure() -> None:
+    a, b = await asyncio_dgram.pair()
+    a._transport.set_write_buffer_limits(high=8, low=4)  # type: ignore
+    b._transport.pause_reading()  # type: ignore
+
+    await a.send(b"12345678")
+    assert a._drained.is_set()
+
+    send = asyncio.create_task(a.send(b"9"))
+    await asyncio.sleep(0.05)
+    assert not send.done()
+    assert not a._drained.is_set()
+
+    b._transport.resume_reading()  # type: ignore
+    await asyncio.wait_for(send, 0.05)
+    assert a._drained.is_set()
+
+    data, _ = await b.recv()
+    assert data == b"12345678"
+    data, _ = await b.recv()
+    assert data == b"9"
+
+    a.close()
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_pair_close_delivers_buffer() -> None:
+    a, b = await asyncio_dgram.pair()
+    b.set_recv_queue_limits(high=2, low=1)
+
+    for i in range(5):
+        await a.send(b"%d" % (i,))
+    a.close()
+
+    # Datagrams already sent are still delivered as b reads them.
+    for i in range(5):
+        data, _ = await asyncio.wait_for(b.recv(), 0.05)
+        assert data == b"%d" % (i,)
+
+    # Unless b closes first.
+    c, d = await asyncio_dgram.pair()
+    d.set_recv_queue_limits(high=2, low=1)
+    for i in range(5):
+        await c.send(b"%d" % (i,))
+    c.close()
+    d.close()
+    await asyncio.sleep(0)
+    assert c._transport.get_write_buffer_size() == 0  # type: ignore
+
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_recv_queue_limits() -> None:
+    server = await asyncio_dgram.bind(("127.0.0.1", 0))
+
+    with pytest.raises(ValueError):
+        server.set_recv_queue_limits(high=1, low=2)
+
+    server.set_recv_queue_limits(high=2)
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for i in range(5):
+            sock.sendto(b"%d" % (i,), server.sockname)
+
+        await asyncio.sleep(0.05)
+        assert server.recv_flow_stats["paused"]
+        assert server.recv_flow_stats["pause_count"] == 1
+
+        # The rest are waiting in the kernel and arrive once reading resumes.
+        for i in range(5):
+            data, _ = await asyncio.wait_for(server.recv(), 0.5)
+            assert data == b"%d" % (i,)
+
+    stats = server.recv_flow_stats
+    assert not stats["paused"]
+    assert stats["pause_count"] >= 2
+    assert stats["paused_time"] > 0
+
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_recv_queue_limits_pair() -> None:
+    # Pausing reading on one end of a pair pushes back on the sender.
+    a, b = await asyncio_dgram.pair()
+    a._transport.set_write_buffer_limits(high=0)  # type: ignore
+    b.set_recv_queue_limits(high=2, low=1)
+
+    await a.send(b"1")
+    await a.send(b"2")
+    assert b.recv_flow_stats["paused"]
+
+    send = asyncio.create_task(a.send(b"3"))
+    await asyncio.sleep(0.05)
+    assert not send.done()
+
+    data, _ = await b.recv()
+    assert data == b"1"
+    await asyncio.wait_for(send, 0.05)
+
+    for expected in (b"2", b"3"):
+        data, _ = await b.recv()
+        assert data == expected
+
+    b.set_recv_queue_limits(None)
+    assert not b.recv_flow_stats["paused"]
+
+    a.close()
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_latency_stats() -> None:
+    a, b = await asyncio_dgram.pair()
+    assert b.latency_stats is None
+
+    with pytest.raises(ValueError):
+        b.enable_latency_stats(sample_every=0)
+
+    # Queued before enabling, must not be counted.
+    await a.send(b"untimed")
+
+    a.enable_latency_stats()
+    b.enable_latency_stats(sample_every=2)
+
+    for i in range(10):
+        await a.send(b"%d" % (i,))
+
+    await asyncio.sleep(0.01)
+    for _ in range(11):
+        await b.recv()
+
+    b_stats = b.latency_stats
+    assert b_stats is not None
+    assert b_stats["recv_queue"]["count"] == 5
+    recv_min = b_stats["recv_queue"]["min"]
+    assert recv_min is not None and recv_min >= 0.005
+
+    a_stats = a.latency_stats
+    assert a_stats is not None
+    assert a_stats["send_drain"]["count"] == 10
+    assert a_stats["recv_queue"]["count"] == 0
+
+    b.disable_latency_stats()
+    assert b.latency_stats is None
+
+    a.close()
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_busy_poll() -> None:
+    server = await asyncio_dgram.bind(("127.0.0.1", 0))
+
+    with pytest.raises(ValueError):
+        server.enable_busy_poll(spin=-1)
+
+    # Keep the event loop from reading so only busy polling can.
+    server._transport.pause_reading()  # type: ignore
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.sendto(b"hi", server.sockname)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(server.recv(), 0.05)
+
+        if sys.platform.startswith("linux"):
+            server.enable_busy_poll(spin=0.01, so_busy_poll=0)
+        else:
+            server.enable_busy_poll(spin=0.01)
+
+        data, addr = await asyncio.wait_for(server.recv(), 0.05)
+        assert data == b"hi"
+        assert addr == sock.getsockname()
+
+        server.disable_busy_poll()
+        sock.sendto(b"bye", server.sockname)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(server.recv(), 0.05)
+
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_bind_connect_many(tmp_path: pathlib.Path) -> None:
+    servers = await asyncio_dgram.bind_many(
+        [("127.0.0.1", 0)] * 3 + [("::1", 0), tmp_path / "socket"]
+    )
+    assert all(isinstance(s, asyncio_dgram.aio.DatagramServer) for s in servers)
+    assert len({s.sockname for s in servers}) == 5
+    assert servers[-1].sockname == str(tmp_path / "socket")
+
+    addrs = [s.sockname[:2] for s in servers[:4]] + [tmp_path / "socket"]
+    clients = await asyncio_dgram.connect_many(addrs)
+    assert all(isinstance(c, asyncio_dgram.aio.DatagramClient) for c in clients)
+
+    for i, (client, server) in enumerate(zip(clients, servers)):
+        assert client.peername == server.sockname
+        await client.send(b"%d" % (i,))
+        data, _ = await asyncio.wait_for(server.recv(), 0.5)
+        assert data == b"%d" % (i,)
+
+    asyncio_dgram.close_all(clients)
+    asyncio_dgram.close_all(servers)
+    with pytest.raises(asyncio_dgram.TransportClosed):
+        await clients[0].recv()
+
+
+@pytest.mark.asyncio
+async def test_connect_many_local_ports() -> None:
+    server = await asyncio_dgram.bind(("127.0.0.1", 0))
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        base = sock.getsockname()[1]
+
+    with pytest.raises(ValueError, match="local_port_range"):
+        await asyncio_dgram.connect_many([server.sockname] * 2, range(base, base + 1))
+
+    ports = range(base, base + 2)
+    clients = await asyncio_dgram.connect_many([server.sockname] * 2, ports)
+    assert [c.sockname[1] for c in clients] == list(ports)
+
+    with pytest.raises(ValueError, match="only supported for AF_INET"):
+        await asyncio_dgram.connect_many(["/nonexistent/socket"], ports)
+
+    # Ports already in use fail without leaking the other sockets.
+    with pytest.raises(OSError, match="Address already in use"):
+        await asyncio_dgram.connect_many([server.sockname], ports)
+
+    asyncio_dgram.close_all(clients)
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_latency_stats_with_recv_queue_limits() -> None:
+    # Changing the queue limits must not count as consuming a datagram.
+    a, b = await asyncio_dgram.pair()
+    b.enable_latency_stats()
+    b.set_recv_queue_limits(high=100)
+    b.set_recv_queue_limits(high=50)
+
+    for _ in range(1000):
+        await a.send(b"x")
+        await b.recv()
+
+    stats = b.latency_stats
+    assert stats is not None
+    assert stats["recv_queue"]["count"] == 1000
+    assert len(b._protocol._recv_samples) == 0  # type: ignore
+
+    a.close()
+    b.close()
@@ -0,0 +1,93 @@
+import asyncio
+import pathlib
+import time
+
+import pytest
+
+import asyncio_dgram
+import asyncio_dgram.capture
+
+
+@pytest.mark.asyncio
+async def test_record_and_read(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "capture.dgram"
+    a, b = await asyncio_dgram.pair()
+
+    with asyncio_dgram.Recorder(path) as recorder:
+        recorder.attach(b)
+        await a.send(b"one")
+        await b.send(b"two")
+        await asyncio.sleep(0.02)
+        await a.send(b"three")
+
+    # Detached once the recorder is closed.
+    await a.send(b"four")
+
+    records = list(asyncio_dgram.read_capture(path))
+    assert [(d, data) for _, d, data in records] == [
+        ("recv", b"one"),
+        ("send", b"two"),
+        ("recv", b"three"),
+    ]
+    assert records[2][0] - records[0][0] >= 0.015
+
+    a.close()
+    b.close()
+
+
+def test_read_bad_capture(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "capture.dgram"
+    path.write_bytes(b"junk")
+    with pytest.raises(ValueError, match="not a capture file"):
+        list(asyncio_dgram.read_capture(path))
+
+    with asyncio_dgram.Recorder(path) as recorder:
+        recorder.record_recv(b"truncated")
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        list(asyncio_dgram.read_capture(path))
+
+
+@pytest.mark.asyncio
+async def test_replay(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "capture.dgram"
+    with asyncio_dgram.Recorder(path) as recorder:
+        for i in range(5):
+            recorder.record_recv(b"%d" % (i,))
+            recorder.record_send(b"reply")
+            time.sleep(0.01)
+
+    server = await asyncio_dgram.bind(("127.0.0.1", 0))
+    client = await asyncio_dgram.connect(server.sockname[:2])
+
+    start = time.monotonic()
+    assert await asyncio_dgram.replay(path, client) == 5
+    assert time.monotonic() - start >= 0.035
+
+    for i in range(5):
+        data, _ = await asyncio.wait_for(server.recv(), 0.5)
+        assert data == b"%d" % (i,)
+
+    start = time.monotonic()
+    assert await asyncio_dgram.replay(path, client, rate=0, direction=None) == 10
+    assert time.monotonic() - start < 0.035
+
+    with pytest.raises(ValueError, match="addr is required"):
+        await asyncio_dgram.replay(path, server)
+
+    sender = await asyncio_dgram.bind(("127.0.0.1", 0))
+    n = await asyncio_dgram.replay(
+        path, sender, server.sockname, rate=0, direction="send"
+    )
+    assert n == 5
+
+    server.close()
+    client.close()
+    sender.close()
+
+
+def test_parse_addr() -> None:
+    parse = asyncio_dgram.capture._parse_addr
+    assert parse("127.0.0.1:9999") == ("127.0.0.1", 9999)
+    assert parse("[::1]:9999") == ("::1", 9999)
+    assert parse("/tmp/socket") == "/tmp/socket"
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+import asyncio_dgram
+
+
+@pytest.mark.asyncio
+async def test_coalesce_size_flush() -> None:
+    a, b = await asyncio_dgram.pair()
+    writer = asyncio_dgram.CoalescingWriter(a, mtu=17, flush_interval=10)
+
+    with pytest.raises(ValueError, match="does not fit"):
+        await writer.send(b"x" * 16)
+
+    # 2 + 5 + 2 + 5 == 14, only a message of a single byte still fits.
+    await writer.send(b"one..")
+    await writer.send(b"two..")
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(b.recv(), 0.01)
+
+    await writer.send(b"three")
+    data, _ = await asyncio.wait_for(b.recv(), 0.01)
+    assert asyncio_dgram.split_messages(data) == [b"one..", b"two.."]
+
+    # Exactly filling the mtu flushes right away.
+    await writer.send(b"x" * 8)
+    data, _ = await asyncio.wait_for(b.recv(), 0.01)
+    assert asyncio_dgram.split_messages(data) == [b"three", b"x" * 8]
+
+    await writer.close()
+    a.close()
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_timed_flush() -> None:
+    server = await asyncio_dgram.bind(("127.0.0.1", 0))
+    sender = await asyncio_dgram.bind(("127.0.0.1", 0))
+
+    with pytest.raises(ValueError, match="addr is required"):
+        asyncio_dgram.CoalescingWriter(sender)
+
+    writer = asyncio_dgram.CoalescingWriter(
+        sender, flush_interval=0.02, addr=server.sockname
+    )
+    for i in range(100):
+        await writer.send(b"metric:%d|c" % (i,))
+
+    messages = asyncio_dgram.iter_messages(server)
+    for i in range(100):
+        data, addr = await asyncio.wait_for(messages.__anext__(), 0.5)
+        assert data == b"metric:%d|c" % (i,)
+        assert addr == sender.sockname
+
+    await writer.send(b"last")
+    await writer.close()
+    data, _ = await asyncio.wait_for(messages.__anext__(), 0.5)
+    assert data == b"last"
+
+    server.close()
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(messages.__anext__(), 0.5)
+
+    sender.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_timed_flush_error() -> None:
+    a, b = await asyncio_dgram.pair()
+    writer = asyncio_dgram.CoalescingWriter(a, flush_interval=0.01)
+
+    await writer.send(b"lost")
+    a.close()
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(asyncio_dgram.TransportClosed):
+        await writer.send(b"more")
+
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_large_mtu() -> None:
+    a, b = await asyncio_dgram.pair()
+
+    with pytest.raises(ValueError, match="mtu must be"):
+        asyncio_dgram.CoalescingWriter(a, mtu=128 * 1024)
+
+    writer = asyncio_dgram.CoalescingWriter(a, mtu=0xFFFF + 2)
+    with pytest.raises(ValueError, match="does not fit"):
+        await writer.send(b"x" * 70000)
+
+    await writer.send(b"x" * 0xFFFF)
+    data, _ = await asyncio.wait_for(b.recv(), 0.05)
+    assert asyncio_dgram.split_messages(data) == [b"x" * 0xFFFF]
+
+    a.close()
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_concurrent_send() -> None:
+    a, b = await asyncio_dgram.pair()
+    a._transport.set_write_buffer_limits(high=0)  # type: ignore
+    b._transport.pause_reading()  # type: ignore
+    writer = asyncio_dgram.CoalescingWriter(a, mtu=20, flush_interval=10)
+
+    # The first flush waits for the paused reader while the others queue up.
+    await writer.send(b"0" * 10)
+    sends = [
+        asyncio.ensure_future(writer.send(str(i).encode() * 10)) for i in range(1, 5)
+    ]
+    await asyncio.sleep(0.01)
+    b._transport.resume_reading()  # type: ignore
+    await asyncio.wait_for(asyncio.gather(*sends), 0.5)
+    await writer.flush()
+
+    messages = []
+    for _ in range(5):
+        data, _ = await asyncio.wait_for(b.recv(), 0.05)
+        assert len(data) <= 20
+        messages += asyncio_dgram.split_messages(data)
+    assert messages == [str(i).encode() * 10 for i in range(5)]
+
+    a.close()
+    b.close()
+
+
+def test_split_messages() -> None:
+    assert asyncio_dgram.split_messages(b"") == []
+    assert asyncio_dgram.split_messages(b"\x00\x00\x00\x01a") == [b"", b"a"]
+
+    with pytest.raises(ValueError, match="truncated message header"):
+        asyncio_dgram.split_messages(b"\x00\x01a\x00")
+
+    with pytest.raises(ValueError, match="truncated message at"):
+        asyncio_dgram.split_messages(b"\x00\x02a")
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import struct
+
+import pytest
+
+import asyncio_dgram
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [0, 100, 1388, 1389, 60 * 1024])
+async def test_fragment_roundtrip(size: int) -> None:
+    server = await asyncio_dgram.bind(("127.0.0.1", 0))
+    client = await asyncio_dgram.connect(server.sockname[:2])
+
+    writer = asyncio_dgram.FragmentingWriter(client, mtu=1400)
+    reassembler = asyncio_dgram.Reassembler(server)
+
+    message = os.urandom(size)
+    await writer.send(message)
+    await writer.send(b"next")
+
+    got, addr = await asyncio.wait_for(reassembler.recv(), 1)
+    assert got == message
+    assert addr == client.sockname
+    got, _ = await asyncio.wait_for(reassembler.recv(), 1)
+    assert got == b"next"
+
+    assert reassembler.stats["completed"] == 2
+    assert reassembler.pending == 0
+
+    server.close()
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_fragment_large() -> None:
+    # Too much for the default socket buffers to hold at once, so use a pair.
+    a, b = await asyncio_dgram.pair()
+    writer = asyncio_dgram.FragmentingWriter(a)
+    reassembler = asyncio_dgram.Reassembler(b)
+
+    message = os.urandom(500 * 1024)
+    await writer.send(message)
+    got, _ = await asyncio.wait_for(reassembler.recv(), 1)
+    assert got == message
+
+    a.close()
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_fragment_writer_server() -> None:
+    a = await asyncio_dgram.bind(("127.0.0.1", 0))
+    b = await asyncio_dgram.bind(("127.0.0.1", 0))
+
+    with pytest.raises(ValueError, match="addr is required"):
+        asyncio_dgram.FragmentingWriter(a)
+
+    with pytest.raises(ValueError, match="mtu"):
+        asyncio_dgram.FragmentingWriter(a, mtu=12, addr=b.sockname)
+
+    writer = asyncio_dgram.FragmentingWriter(a, mtu=64, addr=b.sockname)
+    await writer.send(b"x" * 1000)
+    got, _ = await asyncio.wait_for(asyncio_dgram.Reassembler(b).recv(), 1)
+    assert got == b"x" * 1000
+
+    a.close()
+    b.close()
+
+
+def _fragment(msg_id: int, total: int, offset: int, data: bytes) -> bytes:
+    return struct.pack("!III", msg_id, total, offset) + data
+
+
+@pytest.mark.asyncio
+async def test_reassembler_limits() -> None:
+    a, b = await asyncio_dgram.pair()
+    r = asyncio_dgram.Reassembler(b, max_message_size=100, max_pending=150, timeout=1)
+
+    # Out of order and duplicated fragments.
+    assert r._feed(_fragment(1, 6, 3, b"def"), None, 0) is None
+    assert r._feed(_fragment(1, 6, 3, b"def"), None, 0) is None
+    assert r.pending == 6
+    got = r._feed(_fragment(1, 6, 0, b"abc"), None, 0)
+    assert got is not None and bytes(got) == b"abcdef"
+    assert r.pending == 0
+
+    # Late fragments of a completed message are dropped until it is forgotten.
+    assert r._feed(_fragment(1, 6, 3, b"def"), None, 0) is None
+    assert r.pending == 0
+
+    # Invalid fragments.
+    assert r._feed(b"short", None, 0) is None
+    assert r._feed(_fragment(2, 101, 0, b"a"), None, 0) is None
+    assert r._feed(_fragment(2, 10, 8, b"abc"), None, 0) is None
+    assert r.stats["invalid"] == 3
+
+    # Oldest incomplete messages are evicted to stay within max_pending.
+    assert r._feed(_fragment(3, 100, 0, b"a"), None, 0) is None
+    assert r._feed(_fragment(4, 100, 0, b"a"), None, 0.5) is None
+    assert r.stats["evicted"] == 1
+    assert r.pending == 100
+
+    # And expired once too old.
+    assert r._feed(_fragment(5, 10, 0, b"a"), None, 1.5) is None
+    assert r.stats["expired"] == 1
+    assert r.pending == 10
+
+    a.close()
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_reassembler_overlap() -> None:
+    a, b = await asyncio_dgram.pair()
+    r = asyncio_dgram.Reassembler(b)
+
+    # Overlapping fragments cover enough bytes but leave a gap.
+    assert r._feed(_fragment(1, 150, 0, b"a" * 100), None, 0) is None
+    assert r._feed(_fragment(1, 150, 10, b"b" * 100), None, 0) is None
+    assert r._feed(_fragment(1, 150, 50, b"c" * 10), None, 0) is None
+    assert r.stats["invalid"] == 2
+    assert r.stats["completed"] == 0
+
+    got = r._feed(_fragment(1, 150, 100, b"d" * 50), None, 0)
+    assert got is not None and bytes(got) == b"a" * 100 + b"d" * 50
+
+    a.close()
+    b.close()
+
+
+@pytest.mark.asyncio
+async def test_reassembler_max_completed() -> None:
+    a, b = await asyncio_dgram.pair()
+    r = asyncio_dgram.Reassembler(b, max_pending=1024, max_completed=10)
+
+    for msg_id in range(100):
+        assert r._feed(_fragment(msg_id, 2, 0, b"a"), None, 0) is None
+        assert r._feed(_fragment(msg_id, 2, 1, b"b"), None, 0) is not None
+    assert len(r._completed) == 10  # type: ignore
+    assert r.pending == 0
+
+    # Only the most recent are still remembered.
+    assert r._feed(_fragment(99, 2, 1, b"b"), None, 0) is None
+    assert r.pending == 0
+    assert r._feed(_fragment(0, 2, 1, b"b"), None, 0) is None
+    assert r.pending == 2
+
+    a.close()
+    b.close()
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+import asyncio_dgram
+
+
+@pytest.mark.asyncio
+async def test_streamset_recv() -> None:
+    pairs = [await asyncio_dgram.pair() for _ in range(3)]
+    streams = asyncio_dgram.StreamSet(b for _, b in pairs)
+    assert len(streams) == 3
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(streams.recv(), 0.05)
+
+    await pairs[1][0].send(b"one")
+    batch = await asyncio.wait_for(streams.recv(), 0.05)
+    assert [(s, data) for s, data, _ in batch] == [(pairs[1][1], b"one")]
+
+    for a, _ in pairs:
+        await a.send(b"x")
+        await a.send(b"y")
+
+    got = await streams.recv(max_batch=4)
+    assert len(got) == 4
+    got += await streams.recv(max_batch=4)
+    assert len(got) == 6
+    for _, b in pairs:
+        assert [data for s, data, _ in got if s is b] == [b"x", b"y"]
+
+    with pytest.raises(ValueError):
+        await streams.recv(max_batch=0)
+
+    streams.close()
+    assert len(streams) == 0
+    for a, _ in pairs:
+        a.close()
+
+
+@pytest.mark.asyncio
+async def test_streamset_membership() -> None:
+    a, b = await asyncio_dgram.pair()
+
+    # Data queued before joining is picked up.
+    await a.send(b"early")
+    streams = asyncio_dgram.StreamSet([b])
+    assert b in streams
+
+    with pytest.raises(ValueError, match="already belongs"):
+        asyncio_dgram.StreamSet([b])
+
+    batch = await asyncio.wait_for(streams.recv(), 0.05)
+    assert [(s, data) for s, data, _ in batch] == [(b, b"early")]
+
+    streams.discard(b)
+    assert b not in streams
+    await a.send(b"direct")
+    data, _ = await b.recv()
+    assert data == b"direct"
+
+    # Closed streams are removed once drained.
+    streams.add(b)
+    await a.send(b"last")
+    b.close()
+    await asyncio.sleep(0)
+    batch = await asyncio.wait_for(streams.recv(), 0.05)
+    assert [(s, data) for s, data, _ in batch] == [(b, b"last")]
+    assert len(streams) == 0
+
+    a.close()
+
+
+@pytest.mark.asyncio
+async def test_streamset_errors() -> None:
+    a, b = await asyncio_dgram.pair()
+    c, d = await asyncio_dgram.pair()
+    streams = asyncio_dgram.StreamSet([b, d])
+
+    # Sending to a closed peer is reported to the sender.
+    c.close()
+    await d.send(b"lost")
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConnectionRefusedError):
+        await asyncio.wait_for(streams.recv(), 0.05)
+    assert d in streams
+
+    # Held back until the gathered datagrams have been returned.
+    await a.send(b"data")
+    await d.send(b"lost")
+    await asyncio.sleep(0)
+    batch = await asyncio.wait_for(streams.recv(), 0.05)
+    assert [(s, data) for s, data, _ in batch] == [(b, b"data")]
+    with pytest.raises(ConnectionRefusedError):
+        await asyncio.wait_for(streams.recv(), 0.05)
+
+    # Every queued error is raised, one per call.
+    await d.send(b"lost")
+    await d.send(b"lost")
+    await asyncio.sleep(0)
+    for _ in range(2):
+        with pytest.raises(ConnectionRefusedError):
+            await asyncio.wait_for(streams.recv(), 0.05)
+
+    # Including those queued before the stream was added.
+    streams.discard(d)
+    await d.send(b"lost")
+    await asyncio.sleep(0)
+    streams.add(d)
+    with pytest.raises(ConnectionRefusedError):
+        await asyncio.wait_for(streams.recv(), 0.05)
+
+    streams.close()
+    a.close()
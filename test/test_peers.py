@@ -0,0 +1,97 @@
+import asyncio
+import pathlib
+
+import pytest
+
+import asyncio_dgram
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("addr", [("127.0.0.1", 0), ("::1", 0)], ids=["INET", "INET6"])
+async def test_peer_acceptor(addr: tuple[str, int]) -> None:
+    server = await asyncio_dgram.bind(addr, reuse_port=True)
+    acceptor = asyncio_dgram.PeerAcceptor(server)
+
+    client1 = await asyncio_dgram.connect(server.sockname[:2])
+    client2 = await asyncio_dgram.connect(server.sockname[:2])
+
+    await client1.send(b"hello")
+    peer1 = await asyncio.wait_for(acceptor.accept(), 0.5)
+    assert isinstance(peer1, asyncio_dgram.aio.DatagramClient)
+    assert peer1.peername == client1.sockname
+    assert peer1.sockname == server.sockname
+
+    data, peer_addr = await peer1.recv()
+    assert data == b"hello"
+    assert peer_addr == client1.sockname
+
+    # Later datagrams go straight to the connected socket.
+    await client1.send(b"again")
+    data, _ = await asyncio.wait_for(peer1.recv(), 0.5)
+    assert data == b"again"
+
+    await peer1.send(b"reply")
+    data, server_addr = await asyncio.wait_for(client1.recv(), 0.5)
+    assert data == b"reply"
+    assert server_addr == server.sockname
+
+    await client2.send(b"other")
+    peer2 = await asyncio.wait_for(acceptor.accept(), 0.5)
+    assert peer2.peername == client2.sockname
+    data, _ = await peer2.recv()
+    assert data == b"other"
+
+    assert acceptor.peers == {client1.sockname: peer1, client2.sockname: peer2}
+
+    peer2.close()
+    await asyncio.sleep(0)
+    assert list(acceptor.peers) == [client1.sockname]
+
+    acceptor.close()
+    assert acceptor.peers == {}
+
+    server.close()
+    client1.close()
+    client2.close()
+
+
+@pytest.mark.asyncio
+async def test_peer_acceptor_prunes_closed() -> None:
+    server = await asyncio_dgram.bind(("127.0.0.1", 0), reuse_port=True)
+    acceptor = asyncio_dgram.PeerAcceptor(server)
+    clients = []
+
+    # Only accept() is called, closed peers must not pile up.
+    for _ in range(100):
+        client = await asyncio_dgram.connect(server.sockname)
+        clients.append(client)
+        await client.send(b"hello")
+        peer = await asyncio.wait_for(acceptor.accept(), 0.5)
+        peer.close()
+        await asyncio.sleep(0)
+
+    assert len(acceptor._peers) <= 64  # type: ignore
+
+    # A peer whose stream was closed is accepted again.
+    await clients[-1].send(b"back")
+    peer = await asyncio.wait_for(acceptor.accept(), 0.5)
+    assert peer.peername == clients[-1].sockname
+    data, _ = await peer.recv()
+    assert data == b"back"
+
+    acceptor.close()
+    asyncio_dgram.close_all(clients)
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_peer_acceptor_bad_server(tmp_path: pathlib.Path) -> None:
+    server = await asyncio_dgram.bind(("127.0.0.1", 0))
+    with pytest.raises(ValueError, match="reuse_port"):
+        asyncio_dgram.PeerAcceptor(server)
+    server.close()
+
+    server = await asyncio_dgram.bind(tmp_path / "socket")
+    with pytest.raises(ValueError, match="AF_INET"):
+        asyncio_dgram.PeerAcceptor(server)
+    server.close()
@@ -0,0 +1,64 @@
+import asyncio
+import concurrent.futures
+import json
+import typing
+
+import pytest
+
+import asyncio_dgram
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False], ids=["ordered", "unordered"])
+async def test_decode_pipeline(ordered: bool) -> None:
+    a, b = await asyncio_dgram.pair()
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+        pipeline = asyncio_dgram.DecodePipeline(
+            b, json.loads, pool, batch_size=8, buffer_size=64, ordered=ordered
+        )
+
+        # Includes a datagram larger than the shared memory blocks.
+        sent: typing.List[typing.Any] = [{"n": i} for i in range(50)]
+        sent.append({"big": "x" * 100})
+        for msg in sent:
+            await a.send(json.dumps(msg).encode())
+
+        async def close_later() -> None:
+            await asyncio.sleep(0.2)
+            b.close()
+
+        closer = asyncio.create_task(close_later())
+
+        got: typing.List[typing.Any] = []
+        async for result, addr in pipeline:
+            assert addr is None
+            got.append(result)
+
+        await closer
+
+    if ordered:
+        assert got == sent
+    else:
+        assert sorted(got, key=str) == sorted(sent, key=str)
+
+    a.close()
+
+
+@pytest.mark.asyncio
+async def test_decode_pipeline_error() -> None:
+    a, b = await asyncio_dgram.pair()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        pipeline = asyncio_dgram.DecodePipeline(b, json.loads, pool)
+        await a.send(b"not json")
+
+        with pytest.raises(json.JSONDecodeError):
+            async for _ in pipeline:
+                pass
+
+    with pytest.raises(ValueError):
+        asyncio_dgram.DecodePipeline(b, json.loads, pool, batch_size=0)
+
+    a.close()
+    b.close()
@@ -0,0 +1,54 @@
+import pytest
+
+import asyncio_dgram
+
+
+def test_histogram_empty() -> None:
+    hist = asyncio_dgram.Histogram()
+
+    assert hist.percentile(50) is None
+    assert hist.to_dict(percentiles=(50,)) == {
+        "count": 0,
+        "min": None,
+        "max": None,
+        "mean": None,
+        "p50": None,
+    }
+
+
+def test_histogram_percentiles() -> None:
+    hist = asyncio_dgram.Histogram()
+
+    for ns in range(1, 10001):
+        hist.record(ns * 1000)
+
+    d = hist.to_dict()
+    assert d["count"] == 10000
+    assert d["min"] == pytest.approx(1e-6)
+    assert d["max"] == pytest.approx(1e-2)
+    assert d["mean"] == pytest.approx(5.0005e-3)
+
+    for pct, key in ((50, "p50"), (90, "p90"), (99, "p99"), (99.9, "p99.9")):
+        expected = pct / 100 * 1e-2
+        value = d[key]
+        assert value is not None
+        assert expected <= value <= expected * 1.125
+
+    assert hist.percentile(100) == pytest.approx(1e-2)
+
+    with pytest.raises(ValueError):
+        hist.percentile(101)
+
+    hist.reset()
+    assert hist.count == 0
+    assert hist.percentile(0) is None
+
+
+def test_histogram_extremes() -> None:
+    hist = asyncio_dgram.Histogram()
+
+    hist.record(-5)
+    hist.record(2**64 - 1)
+
+    assert hist.percentile(0) == 0
+    assert hist.percentile(100) == pytest.approx((2**64 - 1) / 1e9)